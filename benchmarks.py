@@ -0,0 +1,243 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import main
+
+BENCHMARK_FORMAT_VERSION = 1
+CATALOGUE_SIZES = (100, 10_000, 100_000)
+INSTALL_TREES = {
+    # name: (pack folders, files per folder, nested directories per folder)
+    "1k-files": (10, 100, 4),
+    "20k-files": (100, 200, 8),
+}
+CATEGORY_PREFIXES = ("EP", "GP", "SP", "FP", "KIT")
+MIN_REPEATS = 3
+MAX_REPEATS = 50
+TARGET_SECONDS = 0.5
+DEFAULT_THRESHOLD = 0.10
+
+
+def _pack_code(index: int) -> str:
+    prefix = CATEGORY_PREFIXES[index % len(CATEGORY_PREFIXES)]
+    return f"{prefix}{index:06d}"
+
+
+def build_catalogue(size: int) -> List[Dict]:
+    categories: List[Dict] = []
+    per_category = max(1, size // len(CATEGORY_PREFIXES))
+    for start in range(0, size, per_category):
+        items = [
+            {
+                "code": _pack_code(index),
+                "name": f"Synthetic Pack {index}",
+                "enabled": index % 3 != 0,
+                "size_gb": round((index % 97) / 10, 2),
+            }
+            for index in range(start, min(start + per_category, size))
+        ]
+        categories.append({"title": f"Category {start // per_category + 1}", "items": items})
+    return categories
+
+
+def build_sprite(path: Path, size: int) -> None:
+    symbol = (
+        '<symbol id="{code}" viewBox="0 0 256 256"><path d="M10,10h236v236h-236z"/>'
+        '<circle cx="128" cy="128" r="{radius}"/></symbol>\n'
+    )
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(f'<svg xmlns="{main.SVG_NS}" style="display:none">\n')
+        for index in range(size):
+            handle.write(symbol.format(code=_pack_code(index), radius=index % 120 + 1))
+        handle.write("</svg>\n")
+
+
+def build_install_tree(root: Path, folders: int, files: int, depth: int) -> None:
+    for folder_index in range(folders):
+        folder = root / f"EP{folder_index:02d}"
+        directories = [folder]
+        for level in range(depth):
+            directories.append(directories[-1] / f"level{level}")
+        for directory in directories:
+            directory.mkdir(parents=True, exist_ok=True)
+        for file_index in range(files):
+            path = directories[file_index % len(directories)] / f"asset{file_index}.package"
+            with open(path, "wb") as handle:
+                handle.truncate(1024 * (file_index % 64 + 1))
+
+
+def time_call(func: Callable[[], object]) -> Dict[str, float]:
+    func()
+    samples: List[float] = []
+    started = time.perf_counter()
+    while len(samples) < MAX_REPEATS:
+        begin = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - begin)
+        if len(samples) >= MIN_REPEATS and time.perf_counter() - started >= TARGET_SECONDS:
+            break
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "repeats": len(samples),
+    }
+
+
+def _catalogue_benchmarks(workdir: Path, size: int) -> List[Tuple[str, Callable[[], object]]]:
+    categories = build_catalogue(size)
+    markdown = main.generate_markdown(categories)
+    disable_argument = main.build_disable_argument(categories)
+    # Merge against defaults that differ from the state in a few places, the
+    # way a saved checklist drifts from raw.txt.
+    defaults = build_catalogue(size)
+    for item in defaults[0]["items"][::7]:
+        item["enabled"] = not item["enabled"]
+
+    launcher = workdir / f"launcher-{size}.bat"
+    launcher.write_text(
+        "@echo off\nset ARGS=-applaunch 1222670 -console -disablepacks:\nstart \"\" %ARGS%\n",
+        encoding="utf-8",
+    )
+    arguments = [disable_argument, main.DISABLE_PREFIX]
+    flips = itertools.count()
+
+    sprite = workdir / f"svgs-{size}.html"
+    build_sprite(sprite, size)
+
+    state = main.PackState.from_categories(categories)
+    template = main.PackState.from_categories(defaults)
+    snapshot = workdir / f"state-{size}.snapshot"
+    snapshot.write_bytes(main.encode_state_snapshot(state, None))
+
+    # Point the module's file lookups at the generated inputs; the symbol
+    # index is rebuilt on every call so the timing covers a cold load, and the
+    # snapshot is read against a template with the same catalogue shape.
+    main.get_launcher_path = lambda: launcher
+    main.get_default_categories = lambda: defaults
+    main.get_svg_symbol_index = main._index_svg_symbols
+    main.SVG_FILE = sprite
+    main.get_default_pack_state = lambda: template
+
+    return [
+        ("parse_checklist", lambda: main.parse_checklist(markdown)),
+        ("merge_categories_with_defaults", lambda: main.merge_categories_with_defaults(categories)),
+        ("generate_markdown", lambda: main.generate_markdown(categories)),
+        ("encode_state_snapshot", lambda: main.encode_state_snapshot(state, None)),
+        ("read_state_snapshot", lambda: main.read_state_snapshot(snapshot)),
+        ("build_disable_argument", lambda: main.build_disable_argument(categories)),
+        ("summarize_storage", lambda: main.summarize_storage(categories)),
+        ("sync_launcher_argument", lambda: main.sync_launcher_argument(arguments[next(flips) % 2])),
+        ("_load_svg_symbols", main.load_svg_symbols),
+    ]
+
+
+def run_benchmarks(sizes: List[int], trees: List[str]) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory(prefix="sims4-bench-") as temp:
+        workdir = Path(temp)
+        for size in sizes:
+            for name, func in _catalogue_benchmarks(workdir, size):
+                key = f"{name}[{size}]"
+                results[key] = time_call(func)
+                print(f"{key:<45} {results[key]['median'] * 1000:10.3f} ms", file=sys.stderr)
+        for tree in trees:
+            root = workdir / f"tree-{tree}"
+            build_install_tree(root, *INSTALL_TREES[tree])
+            key = f"_directory_size_bytes[{tree}]"
+            results[key] = time_call(lambda: main._directory_size_bytes(root))
+            print(f"{key:<45} {results[key]['median'] * 1000:10.3f} ms", file=sys.stderr)
+    return results
+
+
+def compare_results(
+    baseline: Dict[str, Dict[str, float]],
+    current: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[Dict]:
+    regressions: List[Dict] = []
+    for key, result in sorted(current.items()):
+        previous = baseline.get(key)
+        if previous is None or previous["median"] <= 0:
+            continue
+        ratio = result["median"] / previous["median"]
+        status = "regression" if ratio > 1 + threshold else "ok"
+        print(
+            f"{key:<45} {previous['median'] * 1000:10.3f} ms -> "
+            f"{result['median'] * 1000:10.3f} ms  {ratio:6.2f}x  {status}",
+            file=sys.stderr,
+        )
+        if status == "regression":
+            regressions.append(
+                {"benchmark": key, "baseline": previous["median"], "current": result["median"], "ratio": ratio}
+            )
+    return regressions
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time the checklist state pipeline against synthetic catalogues and install trees."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(CATALOGUE_SIZES),
+        help="Catalogue sizes to generate (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--trees",
+        nargs="+",
+        choices=sorted(INSTALL_TREES),
+        default=sorted(INSTALL_TREES),
+        help="Synthetic install trees to measure.",
+    )
+    parser.add_argument("--output", type=Path, help="Write JSON results here instead of stdout.")
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        metavar="BASELINE",
+        help="Compare against an earlier JSON result and exit non-zero on regressions.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown of the median before a benchmark counts as regressed (default: %(default)s).",
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.trees)
+    report: Dict[str, object] = {
+        "version": BENCHMARK_FORMAT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    exit_code = 0
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if baseline.get("version") != BENCHMARK_FORMAT_VERSION:
+            parser.error(f"{args.compare} was written by an incompatible benchmark version")
+        regressions = compare_results(baseline["results"], results, args.threshold)
+        report["regressions"] = regressions
+        exit_code = 1 if regressions else 0
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output is not None:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main_cli()
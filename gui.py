@@ -0,0 +1,908 @@
+import hashlib
+import json
+import sys
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Tuple
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+try:
+    from PyQt6.QtSvg import QSvgRenderer
+except ImportError:
+    QSvgRenderer = None
+
+from main import (
+    BASE_DIR,
+    SVG_FILE,
+    LauncherPoller,
+    apply_disable_argument,
+    atomic_write_bytes,
+    atomic_write_text,
+    build_payload,
+    current_markdown,
+    current_storage,
+    delete_profile,
+    flush_pending_writes,
+    get_launcher_path,
+    get_svg_symbol,
+    history_depth,
+    last_span,
+    launcher_changed_on_disk,
+    launcher_needs_polling,
+    list_profiles,
+    load_svg_symbols,
+    redo_last_change,
+    reload_state_from_disk,
+    reset_state_to_default,
+    run_once,
+    save_profile,
+    set_launcher_watch_active,
+    start_pack_size_refresh,
+    switch_profile,
+    sync_state_from_launcher,
+    traced,
+    tracing_enabled,
+    undo_last_change,
+    update_item_state,
+    update_items_state,
+)
+
+LAUNCHER_DEBOUNCE_MS = 150
+SVG_ICON_SIZE = 48
+ICON_DEVICE_PIXEL_RATIOS = (1.0, 1.5, 2.0)
+ICON_ATLAS_SIZES = tuple(round(SVG_ICON_SIZE * ratio) for ratio in ICON_DEVICE_PIXEL_RATIOS)
+ICON_ATLAS_PNG = BASE_DIR / "icon_atlas.png"
+ICON_ATLAS_INDEX = BASE_DIR / "icon_atlas.json"
+ICON_ATLAS_VERSION = 1
+ICON_ATLAS_COLUMNS = 16
+ICON_RENDER_THREADS = 4
+MARKDOWN_REFRESH_MS = 300
+SVG_ICON_CACHE: Dict[Tuple[str, float], QtGui.QIcon] = {}
+ICON_ATLAS_LOCK = Lock()
+
+
+def _render_svg_image(svg_bytes: bytes, size: int = SVG_ICON_SIZE) -> QtGui.QImage | None:
+    if QSvgRenderer is None:
+        return None
+    renderer = QSvgRenderer(svg_bytes)
+    if not renderer.isValid():
+        return None
+    image = QtGui.QImage(size, size, QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(QtCore.Qt.GlobalColor.transparent)
+    painter = QtGui.QPainter(image)
+    renderer.render(painter, QtCore.QRectF(0, 0, size, size))
+    painter.end()
+    return image
+
+
+def _icon_from_image(image: QtGui.QImage, device_pixel_ratio: float = 1.0) -> QtGui.QIcon | None:
+    if image.isNull():
+        return None
+    pixmap = QtGui.QPixmap.fromImage(image)
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
+    icon = QtGui.QIcon(pixmap)
+    return None if icon.isNull() else icon
+
+
+def _render_svg_icon(svg_bytes: bytes, size: int = SVG_ICON_SIZE) -> QtGui.QIcon | None:
+    image = _render_svg_image(svg_bytes, size)
+    return None if image is None else _icon_from_image(image)
+
+
+def _svg_file_hash() -> str | None:
+    try:
+        return hashlib.sha256(SVG_FILE.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _build_icon_atlas(digest: str) -> Tuple[QtGui.QImage, Dict[str, Dict[str, List[int]]]] | None:
+    if QSvgRenderer is None:
+        return None
+    symbols = load_svg_symbols()
+    if not symbols:
+        return None
+    codes = sorted(symbols)
+    rows = -(-len(codes) // ICON_ATLAS_COLUMNS)
+    width = ICON_ATLAS_COLUMNS * max(ICON_ATLAS_SIZES)
+    height = rows * sum(ICON_ATLAS_SIZES)
+    atlas = QtGui.QImage(width, height, QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+    atlas.fill(QtCore.Qt.GlobalColor.transparent)
+    offsets: Dict[str, Dict[str, List[int]]] = {}
+    painter = QtGui.QPainter(atlas)
+    band_top = 0
+    for size in ICON_ATLAS_SIZES:
+        band: Dict[str, List[int]] = {}
+        for idx, code in enumerate(codes):
+            renderer = QSvgRenderer(symbols[code])
+            if not renderer.isValid():
+                continue
+            row, col = divmod(idx, ICON_ATLAS_COLUMNS)
+            x, y = col * size, band_top + row * size
+            renderer.render(painter, QtCore.QRectF(x, y, size, size))
+            band[code] = [x, y]
+        offsets[str(size)] = band
+        band_top += rows * size
+    painter.end()
+    buffer = QtCore.QBuffer()
+    buffer.open(QtCore.QIODevice.OpenModeFlag.WriteOnly)
+    saved = atlas.save(buffer, "PNG")
+    buffer.close()
+    index = {"version": ICON_ATLAS_VERSION, "hash": digest, "sizes": offsets}
+    try:
+        if saved:
+            atomic_write_bytes(ICON_ATLAS_PNG, bytes(buffer.data()))
+            atomic_write_text(ICON_ATLAS_INDEX, json.dumps(index, sort_keys=True))
+    except OSError:
+        pass
+    return atlas, offsets
+
+
+def _read_icon_atlas(digest: str) -> Tuple[QtGui.QImage, Dict[str, Dict[str, List[int]]]] | None:
+    try:
+        index = json.loads(ICON_ATLAS_INDEX.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict):
+        return None
+    if index.get("version") != ICON_ATLAS_VERSION or index.get("hash") != digest:
+        return None
+    offsets = index.get("sizes")
+    if not isinstance(offsets, dict):
+        return None
+    if any(str(size) not in offsets for size in ICON_ATLAS_SIZES):
+        return None
+    atlas = QtGui.QImage(str(ICON_ATLAS_PNG))
+    if atlas.isNull():
+        return None
+    return atlas, offsets
+
+
+@run_once
+def get_icon_atlas() -> Tuple[QtGui.QImage, Dict[str, Dict[str, List[int]]]] | None:
+    digest = _svg_file_hash()
+    if digest is None:
+        return None
+    return _read_icon_atlas(digest) or _build_icon_atlas(digest)
+
+
+@traced
+def render_pack_image(code: str, pixel_size: int = SVG_ICON_SIZE) -> QtGui.QImage | None:
+    # Only touches QImage and QSvgRenderer, so it is safe on worker threads.
+    normalized = code.strip().upper()
+    loaded = get_icon_atlas()
+    if loaded is not None:
+        atlas, offsets = loaded
+        band = offsets.get(str(pixel_size))
+        if band is not None:
+            offset = band.get(normalized)
+            if not offset:
+                return None
+            with ICON_ATLAS_LOCK:
+                return atlas.copy(offset[0], offset[1], pixel_size, pixel_size)
+    svg_bytes = get_svg_symbol(normalized)
+    if not svg_bytes:
+        return None
+    return _render_svg_image(svg_bytes, pixel_size)
+
+
+def _icon_pixel_size(device_pixel_ratio: float) -> int:
+    return round(SVG_ICON_SIZE * device_pixel_ratio)
+
+
+def get_pack_icon(code: str, device_pixel_ratio: float = 1.0) -> QtGui.QIcon | None:
+    if not code:
+        return None
+    normalized = code.strip().upper()
+    key = (normalized, device_pixel_ratio)
+    icon = SVG_ICON_CACHE.get(key)
+    if icon:
+        return icon
+    image = render_pack_image(normalized, _icon_pixel_size(device_pixel_ratio))
+    icon = None if image is None else _icon_from_image(image, device_pixel_ratio)
+    if icon:
+        SVG_ICON_CACHE[key] = icon
+    return icon
+
+
+class PackSizeSignals(QtCore.QObject):
+    """Carries background pack size results over to the GUI thread."""
+
+    sizeReady = QtCore.pyqtSignal(str, float, int, int)
+    finished = QtCore.pyqtSignal(bool)
+
+
+class LauncherWatcher(QtCore.QObject):
+    """Pushes external launcher edits into the checklist state as they happen."""
+
+    launcherChanged = QtCore.pyqtSignal(bool)
+    _pollTriggered = QtCore.pyqtSignal()
+
+    def __init__(self, path: Path, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.path = path
+        self._debounce = QtCore.QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(LAUNCHER_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._sync)
+        self._watcher: QtCore.QFileSystemWatcher | None = None
+        self._poller: LauncherPoller | None = None
+        if not str(path):
+            return
+        if launcher_needs_polling(path):
+            self._pollTriggered.connect(self._debounce.start)
+            self._poller = LauncherPoller(path, self._pollTriggered.emit)
+            self._poller.start()
+        else:
+            self._watcher = QtCore.QFileSystemWatcher(self)
+            self._watcher.fileChanged.connect(self._handle_change)
+            self._watcher.directoryChanged.connect(self._handle_change)
+            self._watch_paths()
+        set_launcher_watch_active(True)
+
+    def _watch_paths(self) -> None:
+        # Atomic replaces drop the file from the watch list, so the parent
+        # directory is watched as well and the file is re-added on change.
+        if self._watcher is None:
+            return
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        for candidate in (self.path.parent, self.path):
+            if str(candidate) not in watched and candidate.exists():
+                self._watcher.addPath(str(candidate))
+
+    def _handle_change(self, _path: str) -> None:
+        self._watch_paths()
+        self._debounce.start()
+
+    def _sync(self) -> None:
+        if not launcher_changed_on_disk():
+            return
+        self.launcherChanged.emit(sync_state_from_launcher())
+
+    def stop(self) -> None:
+        set_launcher_watch_active(False)
+        if self._poller is not None:
+            self._poller.stop()
+        if self._watcher is not None:
+            paths = self._watcher.files() + self._watcher.directories()
+            if paths:
+                self._watcher.removePaths(paths)
+
+
+def placeholder_icon(device_pixel_ratio: float = 1.0) -> QtGui.QIcon:
+    size = _icon_pixel_size(device_pixel_ratio)
+    pixmap = QtGui.QPixmap(size, size)
+    pixmap.fill(QtCore.Qt.GlobalColor.transparent)
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
+    return QtGui.QIcon(pixmap)
+
+
+class IconRenderSignals(QtCore.QObject):
+    """Carries rendered icon images from the worker pool to the GUI thread."""
+
+    rendered = QtCore.pyqtSignal(str, float, QtGui.QImage)
+
+
+class IconRenderTask(QtCore.QRunnable):
+    """Renders one pack icon into a QImage on a worker thread."""
+
+    def __init__(self, code: str, device_pixel_ratio: float, signals: IconRenderSignals) -> None:
+        super().__init__()
+        self.code = code
+        self.device_pixel_ratio = device_pixel_ratio
+        self.signals = signals
+
+    def run(self) -> None:
+        image = render_pack_image(self.code, _icon_pixel_size(self.device_pixel_ratio))
+        self.signals.rendered.emit(
+            self.code, self.device_pixel_ratio, image if image is not None else QtGui.QImage()
+        )
+
+
+class PackIconLoader(QtCore.QObject):
+    """Hands out cached pack icons and renders missing ones off the GUI thread."""
+
+    iconReady = QtCore.pyqtSignal(str, QtGui.QIcon)
+
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(ICON_RENDER_THREADS)
+        self._signals = IconRenderSignals(self)
+        self._signals.rendered.connect(self._handle_rendered)
+        self._pending: set[Tuple[str, float]] = set()
+
+    def request(self, code: str, device_pixel_ratio: float) -> QtGui.QIcon | None:
+        key = (code, device_pixel_ratio)
+        icon = SVG_ICON_CACHE.get(key)
+        if icon is not None:
+            return icon
+        if key not in self._pending:
+            self._pending.add(key)
+            self._pool.start(IconRenderTask(code, device_pixel_ratio, self._signals))
+        return None
+
+    def _handle_rendered(self, code: str, device_pixel_ratio: float, image: QtGui.QImage) -> None:
+        key = (code, device_pixel_ratio)
+        self._pending.discard(key)
+        icon = _icon_from_image(image, device_pixel_ratio)
+        if icon is None:
+            return
+        SVG_ICON_CACHE[key] = icon
+        self.iconReady.emit(code, icon)
+
+
+PACK_CODE_ROLE = QtCore.Qt.ItemDataRole.UserRole + 1
+PACK_SIZE_ROLE = QtCore.Qt.ItemDataRole.UserRole + 2
+PACK_SEARCH_ROLE = QtCore.Qt.ItemDataRole.UserRole + 3
+
+
+class PackListModel(QtCore.QAbstractItemModel):
+    """Two-level model of categories and their packs over the checklist state."""
+
+    toggleRequested = QtCore.pyqtSignal(str, bool)
+
+    def __init__(self, icon_loader: PackIconLoader, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.icon_loader = icon_loader
+        self.device_pixel_ratio = 1.0
+        self._placeholder = placeholder_icon()
+        self._titles: List[str] = []
+        self._items: List[List[Dict]] = []
+        self._rows: Dict[str, Tuple[int, int]] = {}
+        icon_loader.iconReady.connect(self.handle_icon_ready)
+
+    def set_device_pixel_ratio(self, device_pixel_ratio: float) -> None:
+        if device_pixel_ratio == self.device_pixel_ratio:
+            return
+        self.device_pixel_ratio = device_pixel_ratio
+        self._placeholder = placeholder_icon(device_pixel_ratio)
+        self._emit_all_rows([QtCore.Qt.ItemDataRole.DecorationRole])
+
+    def set_categories(self, categories: List[Dict]) -> None:
+        structure = [
+            (category["title"], [item["code"] for item in category["items"]])
+            for category in categories
+        ]
+        current = [
+            (title, [item["code"] for item in items])
+            for title, items in zip(self._titles, self._items)
+        ]
+        if structure != current:
+            self.beginResetModel()
+            self._titles = [category["title"] for category in categories]
+            self._items = [[dict(item) for item in category["items"]] for category in categories]
+            self._rows = {
+                item["code"]: (category_row, item_row)
+                for category_row, items in enumerate(self._items)
+                for item_row, item in enumerate(items)
+            }
+            self.endResetModel()
+            return
+        for category in categories:
+            for item in category["items"]:
+                self.update_item(item["code"], item)
+
+    def update_item(self, code: str, values: Dict) -> None:
+        position = self._rows.get(code)
+        if position is None:
+            return
+        stored = self._items[position[0]][position[1]]
+        changed = {key: value for key, value in values.items() if stored.get(key) != value}
+        if not changed:
+            return
+        stored.update(changed)
+        index = self.createIndex(position[1], 0, position[0] + 1)
+        self.dataChanged.emit(index, index)
+
+    def handle_icon_ready(self, code: str, _icon: QtGui.QIcon) -> None:
+        position = self._rows.get(code)
+        if position is None:
+            return
+        index = self.createIndex(position[1], 0, position[0] + 1)
+        self.dataChanged.emit(index, index, [QtCore.Qt.ItemDataRole.DecorationRole])
+
+    def item_for_index(self, index: QtCore.QModelIndex) -> Dict | None:
+        if not index.isValid() or index.internalId() == 0:
+            return None
+        return self._items[index.internalId() - 1][index.row()]
+
+    def category_items(self, index: QtCore.QModelIndex) -> List[Dict]:
+        if not index.isValid() or index.internalId() != 0:
+            return []
+        return self._items[index.row()]
+
+    def _emit_all_rows(self, roles: List[int]) -> None:
+        for category_row, items in enumerate(self._items):
+            if not items:
+                continue
+            first = self.createIndex(0, 0, category_row + 1)
+            last = self.createIndex(len(items) - 1, 0, category_row + 1)
+            self.dataChanged.emit(first, last, roles)
+
+    def index(
+        self, row: int, column: int, parent: QtCore.QModelIndex = QtCore.QModelIndex()
+    ) -> QtCore.QModelIndex:
+        if column != 0 or row < 0:
+            return QtCore.QModelIndex()
+        if not parent.isValid():
+            if row >= len(self._titles):
+                return QtCore.QModelIndex()
+            return self.createIndex(row, 0, 0)
+        if parent.internalId() != 0 or row >= len(self._items[parent.row()]):
+            return QtCore.QModelIndex()
+        return self.createIndex(row, 0, parent.row() + 1)
+
+    def parent(self, index: QtCore.QModelIndex = QtCore.QModelIndex()) -> QtCore.QModelIndex:
+        if not index.isValid() or index.internalId() == 0:
+            return QtCore.QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if not parent.isValid():
+            return len(self._titles)
+        if parent.internalId() == 0:
+            return len(self._items[parent.row()])
+        return 0
+
+    def columnCount(self, _parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 1
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlag:
+        if not index.isValid():
+            return QtCore.Qt.ItemFlag.NoItemFlags
+        flags = QtCore.Qt.ItemFlag.ItemIsEnabled
+        if index.internalId() != 0:
+            flags |= QtCore.Qt.ItemFlag.ItemIsSelectable | QtCore.Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole) -> object:
+        if not index.isValid():
+            return None
+        item = self.item_for_index(index)
+        if item is None:
+            title = self._titles[index.row()]
+            if role == QtCore.Qt.ItemDataRole.DisplayRole:
+                return f"{title} ({len(self._items[index.row()])})"
+            if role == PACK_SEARCH_ROLE:
+                return title
+            if role == QtCore.Qt.ItemDataRole.FontRole:
+                font = QtGui.QFont()
+                font.setBold(True)
+                return font
+            return None
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return item["name"]
+        if role == PACK_CODE_ROLE:
+            return item["code"]
+        if role == PACK_SIZE_ROLE:
+            return float(item.get("size_gb", 0.0))
+        if role == PACK_SEARCH_ROLE:
+            return f"{item['name']} {item['code']}"
+        if role == QtCore.Qt.ItemDataRole.CheckStateRole:
+            return (
+                QtCore.Qt.CheckState.Checked
+                if item.get("enabled", False)
+                else QtCore.Qt.CheckState.Unchecked
+            )
+        if role == QtCore.Qt.ItemDataRole.DecorationRole:
+            icon = self.icon_loader.request(item["code"], self.device_pixel_ratio)
+            return icon or self._placeholder
+        return None
+
+    def setData(
+        self, index: QtCore.QModelIndex, value: object, role: int = QtCore.Qt.ItemDataRole.EditRole
+    ) -> bool:
+        item = self.item_for_index(index)
+        if item is None or role != QtCore.Qt.ItemDataRole.CheckStateRole:
+            return False
+        enabled = QtCore.Qt.CheckState(value) == QtCore.Qt.CheckState.Checked
+        self.toggleRequested.emit(item["code"], enabled)
+        return True
+
+
+class PackItemDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints a pack row as check box, icon, name, code and a right-aligned size."""
+
+    def paint(
+        self,
+        painter: QtGui.QPainter,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex,
+    ) -> None:
+        code = index.data(PACK_CODE_ROLE)
+        if code is None:
+            super().paint(painter, option, index)
+            return
+        opt = QtWidgets.QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        widget = opt.widget
+        style = widget.style() if widget is not None else QtWidgets.QApplication.style()
+        name = opt.text
+        opt.text = ""
+        style.drawControl(QtWidgets.QStyle.ControlElement.CE_ItemViewItem, opt, painter, widget)
+        text_rect = style.subElementRect(
+            QtWidgets.QStyle.SubElement.SE_ItemViewItemText, opt, widget
+        )
+        size_text = f"{index.data(PACK_SIZE_ROLE):.2f} GB"
+        metrics = opt.fontMetrics
+        size_width = metrics.horizontalAdvance(size_text) + 12
+        label_rect = text_rect.adjusted(0, 0, -size_width, 0)
+        label = metrics.elidedText(
+            f"{name} ({code})", QtCore.Qt.TextElideMode.ElideRight, label_rect.width()
+        )
+        selected = bool(opt.state & QtWidgets.QStyle.StateFlag.State_Selected)
+        role = (
+            QtGui.QPalette.ColorRole.HighlightedText
+            if selected
+            else QtGui.QPalette.ColorRole.Text
+        )
+        painter.save()
+        painter.setPen(opt.palette.color(role))
+        align = QtCore.Qt.AlignmentFlag.AlignVCenter
+        painter.drawText(label_rect, align | QtCore.Qt.AlignmentFlag.AlignLeft, label)
+        painter.drawText(text_rect, align | QtCore.Qt.AlignmentFlag.AlignRight, size_text)
+        painter.restore()
+
+    def sizeHint(
+        self, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex
+    ) -> QtCore.QSize:
+        hint = super().sizeHint(option, index)
+        return QtCore.QSize(hint.width(), max(hint.height(), SVG_ICON_SIZE + 8))
+
+
+class ChecklistWindow(QtWidgets.QMainWindow):
+    """Simple desktop UI for browsing and updating the Sims 4 DLC checklist."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.setWindowTitle("Sims 4 DLC Checklist")
+        self.resize(1100, 750)
+        self.icon_loader = PackIconLoader(self)
+        self.pack_model = PackListModel(self.icon_loader, self)
+        self.pack_model.toggleRequested.connect(self.handle_toggle_requested)
+        self.state_version: int | None = None
+        # Deltas carry no markdown; re-render the view once changes settle.
+        self._markdown_timer = QtCore.QTimer(self)
+        self._markdown_timer.setSingleShot(True)
+        self._markdown_timer.setInterval(MARKDOWN_REFRESH_MS)
+        self._markdown_timer.timeout.connect(self._refresh_markdown)
+        self._build_ui()
+        self.refresh_payload()
+        self.launcher_watcher = LauncherWatcher(get_launcher_path(), self)
+        self.launcher_watcher.launcherChanged.connect(self.handle_launcher_changed)
+        self._start_size_scan()
+
+    def _start_size_scan(self) -> None:
+        self.size_signals = PackSizeSignals(self)
+        self.size_signals.sizeReady.connect(self.handle_pack_size_ready)
+        self.size_signals.finished.connect(self.handle_pack_size_scan_finished)
+        start_pack_size_refresh(
+            on_size=self.size_signals.sizeReady.emit,
+            on_finished=self.size_signals.finished.emit,
+        )
+
+    def _build_ui(self) -> None:
+        central = QtWidgets.QWidget()
+        self.setCentralWidget(central)
+        main_layout = QtWidgets.QVBoxLayout(central)
+        main_layout.setSpacing(12)
+
+        self.updated_label = QtWidgets.QLabel("Last updated: --")
+        self.updated_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
+        main_layout.addWidget(self.updated_label)
+        self.storage_label = QtWidgets.QLabel("Enabled: 0.00 GB | Disabled: 0.00 GB | Total: 0.00 GB")
+        self.storage_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
+        main_layout.addWidget(self.storage_label)
+
+        self.filter_line = QtWidgets.QLineEdit()
+        self.filter_line.setPlaceholderText("Filter packs by name or code...")
+        self.filter_line.setClearButtonEnabled(True)
+        main_layout.addWidget(self.filter_line)
+
+        self.proxy_model = QtCore.QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.pack_model)
+        self.proxy_model.setFilterRole(PACK_SEARCH_ROLE)
+        self.proxy_model.setFilterCaseSensitivity(QtCore.Qt.CaseSensitivity.CaseInsensitive)
+        self.proxy_model.setRecursiveFilteringEnabled(True)
+        self.filter_line.textChanged.connect(self.handle_filter_changed)
+
+        self.pack_view = QtWidgets.QTreeView()
+        self.pack_view.setModel(self.proxy_model)
+        self.pack_view.setItemDelegate(PackItemDelegate(self.pack_view))
+        self.pack_view.setHeaderHidden(True)
+        self.pack_view.setUniformRowHeights(True)
+        self.pack_view.setIconSize(QtCore.QSize(SVG_ICON_SIZE, SVG_ICON_SIZE))
+        self.pack_view.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.NoSelection)
+        self.pack_view.setContextMenuPolicy(QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
+        self.pack_view.customContextMenuRequested.connect(self.show_category_menu)
+        self.pack_model.modelReset.connect(self.pack_view.expandAll)
+        main_layout.addWidget(self.pack_view, stretch=1)
+
+        disable_row = QtWidgets.QHBoxLayout()
+        disable_label = QtWidgets.QLabel("Disable argument:")
+        self.disable_line = QtWidgets.QLineEdit()
+        self.disable_line.setPlaceholderText("-disablepacks:EP01,EP02,...")
+        self.apply_argument_button = QtWidgets.QPushButton("Apply")
+        self.apply_argument_button.clicked.connect(self.apply_disable_argument_from_ui)
+        disable_row.addWidget(disable_label)
+        disable_row.addWidget(self.disable_line, stretch=1)
+        disable_row.addWidget(self.apply_argument_button)
+        main_layout.addLayout(disable_row)
+
+        profile_row = QtWidgets.QHBoxLayout()
+        profile_label = QtWidgets.QLabel("Profile:")
+        self.profile_combo = QtWidgets.QComboBox()
+        self.profile_combo.setPlaceholderText("No profile selected")
+        self.profile_combo.setSizeAdjustPolicy(
+            QtWidgets.QComboBox.SizeAdjustPolicy.AdjustToContents
+        )
+        self.profile_combo.activated.connect(self.handle_profile_activated)
+        self.save_profile_button = QtWidgets.QPushButton("Save Profile...")
+        self.save_profile_button.clicked.connect(self.save_profile_from_ui)
+        self.delete_profile_button = QtWidgets.QPushButton("Delete Profile")
+        self.delete_profile_button.clicked.connect(self.delete_selected_profile)
+        profile_row.addWidget(profile_label)
+        profile_row.addWidget(self.profile_combo)
+        profile_row.addWidget(self.save_profile_button)
+        profile_row.addWidget(self.delete_profile_button)
+        profile_row.addStretch()
+        main_layout.addLayout(profile_row)
+        self.reload_profiles()
+
+        button_row = QtWidgets.QHBoxLayout()
+        self.undo_button = QtWidgets.QPushButton("Undo")
+        self.undo_button.clicked.connect(self.undo_change)
+        self.redo_button = QtWidgets.QPushButton("Redo")
+        self.redo_button.clicked.connect(self.redo_change)
+        QtGui.QShortcut(QtGui.QKeySequence.StandardKey.Undo, self, self.undo_change)
+        QtGui.QShortcut(QtGui.QKeySequence.StandardKey.Redo, self, self.redo_change)
+        button_row.addWidget(self.undo_button)
+        button_row.addWidget(self.redo_button)
+        self.refresh_button = QtWidgets.QPushButton("Refresh from Disk")
+        self.refresh_button.clicked.connect(self.refresh_from_disk)
+        self.reset_button = QtWidgets.QPushButton("Reset to Default")
+        self.reset_button.clicked.connect(self.reset_state_to_default)
+        button_row.addWidget(self.refresh_button)
+        button_row.addWidget(self.reset_button)
+        button_row.addStretch()
+        main_layout.addLayout(button_row)
+
+        self.markdown_edit = QtWidgets.QPlainTextEdit()
+        self.markdown_edit.setReadOnly(True)
+        self.markdown_edit.setPlaceholderText("Markdown view of the current checklist.")
+        self.markdown_edit.setMinimumHeight(180)
+        main_layout.addWidget(self.markdown_edit)
+
+        self.setStatusBar(QtWidgets.QStatusBar())
+        self.latency_label: QtWidgets.QLabel | None = None
+        if tracing_enabled():
+            self.latency_label = QtWidgets.QLabel()
+            self.statusBar().addPermanentWidget(self.latency_label)
+
+    def _apply_payload(self, payload: Dict) -> None:
+        self.pack_model.set_device_pixel_ratio(self.devicePixelRatioF())
+        if payload["full"]:
+            self.pack_model.set_categories(payload["categories"])
+        else:
+            for item in payload["items"]:
+                self.pack_model.update_item(item["code"], item)
+        self.state_version = payload["version"]
+        self.disable_line.setText(payload["disableArgument"])
+        if payload["full"]:
+            self._markdown_timer.stop()
+            self.markdown_edit.setPlainText(payload["markdown"])
+        else:
+            self._markdown_timer.start()
+        self.updated_label.setText(f"Last updated: {payload['updatedAt']}")
+        self._show_storage(
+            payload.get("storage", {"enabledGB": 0.0, "disabledGB": 0.0, "totalGB": 0.0})
+        )
+        undo_depth, redo_depth = history_depth()
+        self.undo_button.setEnabled(bool(undo_depth))
+        self.redo_button.setEnabled(bool(redo_depth))
+        self._show_latency()
+
+    def _refresh_markdown(self) -> None:
+        self.markdown_edit.setPlainText(current_markdown()["markdown"])
+
+    def _show_latency(self) -> None:
+        span = last_span() if self.latency_label is not None else None
+        if span is not None:
+            name, duration_ms = span
+            self.latency_label.setText(f"{name}: {duration_ms:.1f} ms")
+
+    def _show_storage(self, storage: Dict[str, float]) -> None:
+        self.storage_label.setText(
+            f"Enabled: {storage['enabledGB']:.2f} GB | Disabled: {storage['disabledGB']:.2f} GB | Total: {storage['totalGB']:.2f} GB"
+        )
+
+    def refresh_payload(self) -> None:
+        payload = build_payload(since=self.state_version)
+        self._apply_payload(payload)
+
+    def handle_filter_changed(self, text: str) -> None:
+        self.proxy_model.setFilterFixedString(text.strip())
+        self.pack_view.expandAll()
+
+    def handle_pack_size_ready(
+        self, code: str, size_gb: float, completed: int, total: int
+    ) -> None:
+        self.pack_model.update_item(code, {"size_gb": size_gb})
+        self._show_storage(current_storage())
+        self.statusBar().showMessage(f"Measuring pack sizes... {completed}/{total}")
+
+    def handle_pack_size_scan_finished(self, changed: bool) -> None:
+        if changed:
+            self.refresh_payload()
+            self.reload_profiles(self.profile_combo.currentData())
+        self.statusBar().showMessage("Pack sizes up to date.", 3000)
+
+    def handle_toggle_requested(self, code: str, enabled: bool) -> None:
+        try:
+            payload = update_item_state(code, enabled, since=self.state_version)
+        except KeyError:
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Unknown DLC Code",
+                f"DLC code '{code}' could not be found.",
+            )
+            self.refresh_payload()
+            return
+        self._apply_payload(payload)
+        action = "enabled" if enabled else "disabled"
+        self.statusBar().showMessage(f"{code} {action}", 3000)
+
+    def show_category_menu(self, position: QtCore.QPoint) -> None:
+        index = self.proxy_model.mapToSource(self.pack_view.indexAt(position))
+        items = self.pack_model.category_items(index)
+        if not items:
+            return
+        title = index.data(PACK_SEARCH_ROLE)
+        menu = QtWidgets.QMenu(self)
+        enable_action = menu.addAction(f"Enable all in {title}")
+        disable_action = menu.addAction(f"Disable all in {title}")
+        chosen = menu.exec(self.pack_view.viewport().mapToGlobal(position))
+        if chosen is enable_action:
+            enabled = True
+        elif chosen is disable_action:
+            enabled = False
+        else:
+            return
+        self.set_items_enabled([item["code"] for item in items], enabled, title)
+
+    def set_items_enabled(self, codes: List[str], enabled: bool, title: str) -> None:
+        try:
+            payload = update_items_state(
+                dict.fromkeys(codes, enabled), since=self.state_version
+            )
+        except KeyError as error:
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Unknown DLC Code",
+                f"DLC code '{error.args[0]}' could not be found.",
+            )
+            self.refresh_payload()
+            return
+        self._apply_payload(payload)
+        action = "enabled" if enabled else "disabled"
+        self.statusBar().showMessage(f"All packs in {title} {action}", 3000)
+
+    def apply_disable_argument_from_ui(self) -> None:
+        argument = self.disable_line.text().strip()
+        if not argument:
+            QtWidgets.QMessageBox.warning(
+                self, "Missing Argument", "Enter a -disablepacks argument first."
+            )
+            return
+        try:
+            payload = apply_disable_argument(
+                argument,
+                write_state=True,
+                sync_launcher_file=True,
+                since=self.state_version,
+            )
+        except ValueError as error:
+            QtWidgets.QMessageBox.warning(self, "Invalid Argument", str(error))
+            return
+        flush_pending_writes()
+        self._apply_payload(payload)
+        self.statusBar().showMessage("Disable argument applied.", 3000)
+
+    def reset_state_to_default(self) -> None:
+        payload = reset_state_to_default(since=self.state_version)
+        flush_pending_writes()
+        self._apply_payload(payload)
+        self.statusBar().showMessage("Checklist reset to defaults.", 3000)
+
+    def undo_change(self) -> None:
+        if history_depth()[0]:
+            self._apply_payload(undo_last_change(since=self.state_version))
+            self.statusBar().showMessage("Change undone.", 3000)
+
+    def redo_change(self) -> None:
+        if history_depth()[1]:
+            self._apply_payload(redo_last_change(since=self.state_version))
+            self.statusBar().showMessage("Change redone.", 3000)
+
+    def reload_profiles(self, selected: str | None = None) -> None:
+        self.profile_combo.clear()
+        for profile in list_profiles():
+            storage = profile["storage"]
+            self.profile_combo.addItem(
+                f"{profile['name']} ({storage['enabledGB']:.2f} GB enabled)",
+                profile["name"],
+            )
+        self.profile_combo.setCurrentIndex(self.profile_combo.findData(selected))
+        self.delete_profile_button.setEnabled(self.profile_combo.count() > 0)
+
+    def handle_profile_activated(self, index: int) -> None:
+        name = self.profile_combo.itemData(index)
+        try:
+            payload = switch_profile(name, since=self.state_version)
+        except KeyError:
+            QtWidgets.QMessageBox.warning(
+                self, "Unknown Profile", f"Profile '{name}' could not be found."
+            )
+            self.reload_profiles()
+            return
+        self._apply_payload(payload)
+        self.statusBar().showMessage(f"Switched to profile {name}.", 3000)
+
+    def save_profile_from_ui(self) -> None:
+        name, accepted = QtWidgets.QInputDialog.getText(
+            self, "Save Profile", "Profile name:", text=self.profile_combo.currentData() or ""
+        )
+        if not accepted:
+            return
+        try:
+            profile = save_profile(name)
+        except ValueError as error:
+            QtWidgets.QMessageBox.warning(self, "Invalid Profile", str(error))
+            return
+        except OSError as error:
+            QtWidgets.QMessageBox.warning(self, "Profile Not Saved", str(error))
+            return
+        self.reload_profiles(profile["name"])
+        self.statusBar().showMessage(f"Profile {profile['name']} saved.", 3000)
+
+    def delete_selected_profile(self) -> None:
+        name = self.profile_combo.currentData()
+        if name is None:
+            return
+        answer = QtWidgets.QMessageBox.question(
+            self, "Delete Profile", f"Delete profile '{name}'?"
+        )
+        if answer != QtWidgets.QMessageBox.StandardButton.Yes:
+            return
+        delete_profile(name)
+        self.reload_profiles()
+        self.statusBar().showMessage(f"Profile {name} deleted.", 3000)
+
+    def handle_launcher_changed(self, changed: bool) -> None:
+        if not changed:
+            return
+        self.refresh_payload()
+        self.statusBar().showMessage("Launcher file changed on disk; state updated.", 3000)
+
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        self.launcher_watcher.stop()
+        flush_pending_writes()
+        super().closeEvent(event)
+
+    def refresh_from_disk(self) -> None:
+        changed = reload_state_from_disk()
+        changed = sync_state_from_launcher(force=True) or changed
+        self.refresh_payload()
+        if changed:
+            self.statusBar().showMessage("State synced from state.md and the launcher file.", 3000)
+        else:
+            self.statusBar().showMessage("State already in sync with disk.", 3000)
+
+
+def run() -> None:
+    app = QtWidgets.QApplication(sys.argv)
+    window = ChecklistWindow()
+    window.show()
+    sys.exit(app.exec())
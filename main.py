@@ -1,33 +1,65 @@
 import argparse
-import copy
+import atexit
+import difflib
+import importlib
+import json
+import mmap
 import os
 import re
+import shutil
+import struct
 import sys
-import xml.etree.ElementTree as ET
+import tempfile
+import time
+from array import array
+from contextlib import contextmanager
+from collections import deque
 from datetime import datetime, timezone
-from functools import partial
+from functools import lru_cache, wraps
+from itertools import chain, compress
 from pathlib import Path
-from threading import Lock
-from typing import Dict, List, Tuple
-
-from PyQt6 import QtCore, QtGui, QtWidgets
-
-try:
-    from PyQt6.QtSvg import QSvgRenderer
-except ImportError:
-    QSvgRenderer = None
+from threading import Condition, Event, Lock, RLock, Thread, get_ident
+from typing import BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Tuple, TypeVar
 
 BASE_DIR = Path(__file__).resolve().parent
 STATE_MD = BASE_DIR / "state.md"
+STATE_SNAPSHOT = BASE_DIR / "state.snapshot"
+JOURNAL_FILE = BASE_DIR / "state.journal"
 DEFAULT_MD = BASE_DIR / "default.md"
 SVG_FILE = BASE_DIR / "svgs.html"
+RAW_CHECKLIST_FILE = BASE_DIR / "raw.txt"
+PACK_SIZE_CACHE = BASE_DIR / "pack_sizes.json"
+PACK_SIZE_CACHE_VERSION = 1
+PROFILES_FILE = BASE_DIR / "profiles.json"
+PROFILES_VERSION = 1
+PACK_SCAN_WORKERS = 8
+PERSIST_DELAY_SECONDS = 0.25
+PERSIST_MAX_DELAY_SECONDS = 2.0
+STATE_EXPORT_INTERVAL_SECONDS = 5.0
+STATE_SNAPSHOT_MAGIC = b"S4CS"
+STATE_SNAPSHOT_VERSION = 2
+# magic, version, exported state.md (mtime_ns, size), last journal sequence
+# folded in, title count, record count, string table length; all little-endian.
+STATE_SNAPSHOT_HEADER = struct.Struct("<4sH2xqqqIII")
+JOURNAL_FSYNC_POLICIES = ("always", "interval", "never")
+JOURNAL_FSYNC_INTERVAL_SECONDS = 1.0
+JOURNAL_COMPACT_RECORDS = 1024
+JOURNAL_UNDO_LIMIT = 200
+STATE_CHANGE_LOG_LIMIT = 512
+LAUNCHER_POLL_SECONDS = 1.0
+FORCE_LAUNCHER_POLLING = os.environ.get("SIMS4_WATCH_POLL", "") == "1"
+JOURNAL_FSYNC = os.environ.get("SIMS4_JOURNAL_FSYNC", "interval")
+DEFAULT_SERVE_HOST = "127.0.0.1"
+DEFAULT_SERVE_PORT = 8000
 DEFAULT_LAUNCHER_PATH = r"The Sims 4.bat"
 RAW_LAUNCHER_PATH = os.environ.get("SIMS4_BAT_PATH", DEFAULT_LAUNCHER_PATH)
 DISABLE_PREFIX = "-disablepacks:"
 DISABLE_REGEX = re.compile(r"-disablepacks:[^\s]*", re.IGNORECASE)
 SIZE_SUFFIX_REGEX = re.compile(r"\s+\[(\d+(?:\.\d+)?)\s*GB\]\s*$", re.IGNORECASE)
 SVG_NS = "http://www.w3.org/2000/svg"
-SVG_ICON_SIZE = 48
+SVG_SYMBOL_OPEN_REGEX = re.compile(rb"<symbol\b[^>]*>", re.IGNORECASE)
+SVG_SYMBOL_CLOSE = b"</symbol>"
+SVG_ATTRIBUTE_REGEX = re.compile(rb"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
 BYTES_PER_GIB = 1024 ** 3
 DEFAULT_GAME_PATHS = [
     Path(r"C:\Program Files (x86)\Steam\steamapps\common\The Sims 4"),
@@ -35,78 +67,227 @@ DEFAULT_GAME_PATHS = [
     Path(r"C:\Program Files\EA Games\The Sims 4"),
 ]
 RAW_GAME_PATH = os.environ.get("SIMS4_GAME_PATH", "")
-SVG_SYMBOLS: Dict[str, bytes] = {}
-SVG_ICON_CACHE: Dict[str, QtGui.QIcon] = {}
 PACK_SIZE_GB: Dict[str, float] = {}
 
-ET.register_namespace("", SVG_NS)
+T = TypeVar("T")
+F = TypeVar("F", bound=Callable[..., object])
+TRACE_FORMATS = ("chrome", "summary")
 
-with open('raw.txt', 'r') as f:
-    RAW_CHECKLIST = f.read()
+TRACE_LOCK = Lock()
+_tracing = False
+_trace_origin_ns = 0
+_trace_events: List[Tuple[str, int, int, int]] = []
+_last_span: Tuple[str, float] | None = None
 
 
-def _svg_tag(tag: str) -> str:
-    return f"{{{SVG_NS}}}{tag}"
+def enable_tracing() -> None:
+    global _tracing, _trace_origin_ns
+    with TRACE_LOCK:
+        if not _tracing:
+            _trace_origin_ns = time.perf_counter_ns()
+            _tracing = True
 
 
-def _load_svg_symbols() -> Dict[str, bytes]:
-    if not SVG_FILE.exists():
-        return {}
+def _record_span(name: str, start_ns: int, end_ns: int) -> None:
+    global _last_span
+    with TRACE_LOCK:
+        _trace_events.append((name, start_ns, end_ns, get_ident()))
+        _last_span = (name, (end_ns - start_ns) / 1_000_000)
+
+
+def _call_traced(name: str, func: Callable[..., T], *args: object, **kwargs: object) -> T:
+    start = time.perf_counter_ns()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _record_span(name, start, time.perf_counter_ns())
+
+
+def traced(func: F) -> F:
+    # Disabled tracing costs one global check per call.
+    name = func.__qualname__
+
+    @wraps(func)
+    def wrapper(*args: object, **kwargs: object) -> object:
+        if not _tracing:
+            return func(*args, **kwargs)
+        return _call_traced(name, func, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def tracing_enabled() -> bool:
+    return _tracing
+
+
+def last_span() -> Tuple[str, float] | None:
+    with TRACE_LOCK:
+        return _last_span
+
+
+def trace_summary() -> Dict[str, Dict[str, float]]:
+    with TRACE_LOCK:
+        events = list(_trace_events)
+    summary: Dict[str, Dict[str, float]] = {}
+    for name, start_ns, end_ns, _thread in events:
+        duration_ms = (end_ns - start_ns) / 1_000_000
+        entry = summary.setdefault(name, {"count": 0, "totalMs": 0.0, "maxMs": 0.0})
+        entry["count"] += 1
+        entry["totalMs"] += duration_ms
+        entry["maxMs"] = max(entry["maxMs"], duration_ms)
+    for entry in summary.values():
+        entry["meanMs"] = entry["totalMs"] / entry["count"]
+    return dict(sorted(summary.items(), key=lambda pair: -pair[1]["totalMs"]))
+
+
+def write_trace(path: Path, trace_format: str = "chrome") -> None:
+    if trace_format == "summary":
+        report: object = trace_summary()
+    else:
+        with TRACE_LOCK:
+            events = list(_trace_events)
+        pid = os.getpid()
+        report = {
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": "checklist",
+                    "ph": "X",
+                    "ts": (start_ns - _trace_origin_ns) / 1000,
+                    "dur": (end_ns - start_ns) / 1000,
+                    "pid": pid,
+                    "tid": thread,
+                }
+                for name, start_ns, end_ns, thread in events
+            ],
+        }
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+def _write_trace_at_exit(path: Path, trace_format: str) -> None:
+    # Registered after flush_pending_writes, so it runs first; flush here so
+    # the final write-behind pass lands in the report.
+    flush_pending_writes()
+    write_trace(path, trace_format)
+
+
+def run_once(loader: Callable[[], T]) -> Callable[[], T]:
+    # Start-up stages are computed on first use and shared afterwards. A stage
+    # may depend on earlier stages but never on itself, so re-entry is a bug.
+    lock = RLock()
+    results: List[T] = []
+    running = False
+
+    @wraps(loader)
+    def wrapper() -> T:
+        nonlocal running
+        if results:
+            return results[0]
+        with lock:
+            if not results:
+                if running:
+                    raise RuntimeError(f"{loader.__name__} re-entered during start-up.")
+                running = True
+                try:
+                    if _tracing:
+                        results.append(_call_traced(loader.__name__, loader))
+                    else:
+                        results.append(loader())
+                finally:
+                    running = False
+        return results[0]
+
+    return wrapper
+
+
+@run_once
+def get_raw_checklist() -> str:
+    return RAW_CHECKLIST_FILE.read_text(encoding="utf-8")
+
+
+def _index_svg_symbols() -> Dict[str, Tuple[int, int]]:
+    # One pass over the mapped sprite file recording where each <symbol>
+    # element starts and ends; symbols are only sliced out when requested.
+    index: Dict[str, Tuple[int, int]] = {}
     try:
-        tree = ET.parse(SVG_FILE)
-    except (ET.ParseError, OSError):
+        with open(SVG_FILE, "rb") as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for match in SVG_SYMBOL_OPEN_REGEX.finditer(data):
+                    end = data.find(SVG_SYMBOL_CLOSE, match.end())
+                    if end == -1:
+                        break
+                    attributes = _parse_svg_attributes(match.group(0))
+                    symbol_id = attributes.get("id", "").strip().upper()
+                    if symbol_id and not match.group(0).endswith(b"/>"):
+                        index[symbol_id] = (match.start(), end + len(SVG_SYMBOL_CLOSE))
+    except (OSError, ValueError):
         return {}
-    root = tree.getroot()
-    symbols: Dict[str, bytes] = {}
-    for symbol in root.findall(_svg_tag("symbol")):
-        symbol_id = symbol.attrib.get("id")
-        if not symbol_id:
-            continue
-        view_box = symbol.attrib.get("viewBox") or "0 0 256 256"
-        svg_element = ET.Element(_svg_tag("svg"), attrib={"viewBox": view_box})
-        for attr in ("width", "height"):
-            value = symbol.attrib.get(attr)
-            if value:
-                svg_element.set(attr, value)
-        for child in symbol:
-            svg_element.append(copy.deepcopy(child))
-        svg_bytes = ET.tostring(svg_element, encoding="utf-8")
-        symbols[symbol_id.strip().upper()] = svg_bytes
-    return symbols
+    return index
 
 
-def _render_svg_icon(svg_bytes: bytes, size: int = SVG_ICON_SIZE) -> QtGui.QIcon | None:
-    if QSvgRenderer is None:
-        return None
-    renderer = QSvgRenderer(svg_bytes)
-    if not renderer.isValid():
+def _parse_svg_attributes(tag: bytes) -> Dict[str, str]:
+    return {
+        match.group(1).decode("utf-8", "replace"): (
+            match.group(2) if match.group(2) is not None else match.group(3)
+        ).decode("utf-8", "replace")
+        for match in SVG_ATTRIBUTE_REGEX.finditer(tag)
+    }
+
+
+def _wrap_svg_symbol(element: bytes) -> bytes:
+    open_end = element.index(b">") + 1
+    attributes = _parse_svg_attributes(element[:open_end])
+    inner = element[open_end : -len(SVG_SYMBOL_CLOSE)]
+    view_box = attributes.get("viewBox") or "0 0 256 256"
+    header = f'<svg xmlns="{SVG_NS}" viewBox="{view_box}"'
+    for attr in ("width", "height"):
+        value = attributes.get(attr)
+        if value:
+            header += f' {attr}="{value}"'
+    if b"xlink:" in inner:
+        header += ' xmlns:xlink="http://www.w3.org/1999/xlink"'
+    return header.encode("utf-8") + b">" + inner + b"</svg>"
+
+
+def _read_svg_symbol(handle: BinaryIO, span: Tuple[int, int]) -> bytes | None:
+    start, end = span
+    handle.seek(start)
+    element = handle.read(end - start)
+    if not element.endswith(SVG_SYMBOL_CLOSE):
         return None
-    pixmap = QtGui.QPixmap(size, size)
-    pixmap.fill(QtCore.Qt.GlobalColor.transparent)
-    painter = QtGui.QPainter(pixmap)
-    renderer.render(painter, QtCore.QRectF(0, 0, size, size))
-    painter.end()
-    icon = QtGui.QIcon(pixmap)
-    return None if icon.isNull() else icon
+    return _wrap_svg_symbol(element)
 
 
-def get_pack_icon(code: str) -> QtGui.QIcon | None:
-    if not code:
+def get_svg_symbol(code: str) -> bytes | None:
+    span = get_svg_symbol_index().get(code.strip().upper())
+    if span is None:
         return None
-    normalized = code.strip().upper()
-    icon = SVG_ICON_CACHE.get(normalized)
-    if icon:
-        return icon
-    svg_bytes = SVG_SYMBOLS.get(normalized)
-    if not svg_bytes:
+    try:
+        with open(SVG_FILE, "rb") as handle:
+            return _read_svg_symbol(handle, span)
+    except OSError:
         return None
-    icon = _render_svg_icon(svg_bytes)
-    if icon:
-        SVG_ICON_CACHE[normalized] = icon
-    return icon
 
 
-SVG_SYMBOLS = _load_svg_symbols()
+def load_svg_symbols() -> Dict[str, bytes]:
+    symbols: Dict[str, bytes] = {}
+    index = get_svg_symbol_index()
+    if not index:
+        return symbols
+    try:
+        with open(SVG_FILE, "rb") as handle:
+            for symbol_id, span in index.items():
+                svg_bytes = _read_svg_symbol(handle, span)
+                if svg_bytes:
+                    symbols[symbol_id] = svg_bytes
+    except OSError:
+        return {}
+    return symbols
+
+
+get_svg_symbol_index = run_once(_index_svg_symbols)
+get_svg_symbols = run_once(load_svg_symbols)
 
 
 def _resolve_launcher_path(raw_path: str) -> Path:
@@ -124,7 +305,9 @@ def _resolve_launcher_path(raw_path: str) -> Path:
     return candidate
 
 
-LAUNCHER_BAT = _resolve_launcher_path(RAW_LAUNCHER_PATH)
+@run_once
+def get_launcher_path() -> Path:
+    return _resolve_launcher_path(RAW_LAUNCHER_PATH)
 
 
 def _resolve_game_path(raw_path: str) -> Path | None:
@@ -151,30 +334,205 @@ def _parse_name_and_size(name: str) -> Tuple[str, float | None]:
     return text[:match.start()].rstrip(), size_gb
 
 
-def _directory_size_bytes(path: Path) -> int:
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once at import; os.umask is process-wide and cannot be read safely
+# while writer threads run.
+FILE_UMASK = _current_umask()
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    # Replaces the file a symlink points at rather than the link, keeps its
+    # mode, and gives every writer its own temp file.
+    target = path.resolve()
+    with tempfile.NamedTemporaryFile(
+        dir=target.parent, prefix=f".{target.name}.", suffix=".tmp", delete=False
+    ) as handle:
+        temp_path = handle.name
+        try:
+            handle.write(data)
+        except BaseException:
+            handle.close()
+            os.unlink(temp_path)
+            raise
+    try:
+        if target.exists():
+            shutil.copymode(target, temp_path)
+        else:
+            os.chmod(temp_path, 0o666 & ~FILE_UMASK)
+        os.replace(temp_path, target)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def _scan_directory(path: Path, *, measure: bool) -> Tuple[List[int], int] | None:
+    # The fingerprint uses directory metadata only: entries added, removed or
+    # replaced by a game update bump the mtime of their parent directory.
+    # File sizes come from the DirEntry stat data, which scandir already has
+    # on Windows and which costs at most one lstat elsewhere.
+    try:
+        root_stat = os.stat(path)
+    except OSError:
+        return None
+    dir_count = 0
+    file_count = 0
+    mtime_total = root_stat.st_mtime_ns
     total = 0
-    for root, _dirs, files in os.walk(path):
-        for filename in files:
-            file_path = Path(root) / filename
-            try:
-                total += file_path.stat().st_size
-            except OSError:
-                continue
-    return total
+    pending = [os.fspath(path)]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        dir_count += 1
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        mtime_total += entry.stat(follow_symlinks=False).st_mtime_ns
+                        pending.append(entry.path)
+                        continue
+                    file_count += 1
+                    if measure:
+                        total += entry.stat().st_size
+                except OSError:
+                    continue
+    return [root_stat.st_ino, dir_count, file_count, mtime_total], total
 
 
-GAME_INSTALL_DIR = _resolve_game_path(RAW_GAME_PATH)
+def _pack_fingerprint(path: Path) -> List[int] | None:
+    scanned = _scan_directory(path, measure=False)
+    return None if scanned is None else scanned[0]
 
 
-def load_pack_sizes(codes: set[str]) -> Dict[str, float]:
+def _read_pack_size_cache(install_dir: Path, cache_path: Path | None = None) -> Dict[str, Dict]:
+    try:
+        data = json.loads((cache_path or PACK_SIZE_CACHE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    if data.get("version") != PACK_SIZE_CACHE_VERSION:
+        return {}
+    if data.get("root") != str(install_dir):
+        return {}
+    packs = data.get("packs")
+    return packs if isinstance(packs, dict) else {}
+
+
+def _write_pack_size_cache(
+    install_dir: Path, packs: Dict[str, Dict], cache_path: Path | None = None
+) -> None:
+    data = {
+        "version": PACK_SIZE_CACHE_VERSION,
+        "root": str(install_dir),
+        "packs": packs,
+    }
+    try:
+        atomic_write_text(cache_path or PACK_SIZE_CACHE, json.dumps(data, indent=2, sort_keys=True))
+    except OSError:
+        return
+
+
+def _directory_size_bytes(path: Path) -> int:
+    scanned = _scan_directory(path, measure=True)
+    return 0 if scanned is None else scanned[1]
+
+
+@run_once
+def get_game_install_dir() -> Path | None:
+    return _resolve_game_path(RAW_GAME_PATH)
+
+
+def _is_cache_entry(entry: object) -> bool:
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("fingerprint"), list)
+        and isinstance(entry.get("bytes"), int)
+    )
+
+
+def _measure_pack(folder: Path, cached: Dict | None) -> Dict | None:
+    if _is_cache_entry(cached):
+        fingerprint = _pack_fingerprint(folder)
+        if fingerprint is None:
+            return None
+        if fingerprint == cached["fingerprint"]:
+            return cached
+    scanned = _scan_directory(folder, measure=True)
+    if scanned is None:
+        return None
+    fingerprint, size_bytes = scanned
+    return {"fingerprint": fingerprint, "bytes": size_bytes}
+
+
+def load_cached_pack_sizes(codes: set[str]) -> Dict[str, float]:
+    install_dir = get_game_install_dir()
+    if install_dir is None:
+        return {code: 0.0 for code in codes}
+    cached = _read_pack_size_cache(install_dir)
+    return {
+        code: round(entry["bytes"] / BYTES_PER_GIB, 2)
+        for code, entry in cached.items()
+        if code in codes and _is_cache_entry(entry)
+    }
+
+
+@traced
+def load_pack_sizes(
+    codes: set[str],
+    on_size: Callable[[str, float, int, int], None] | None = None,
+) -> Dict[str, float]:
+    install_dir = get_game_install_dir()
+    if install_dir is None or not codes:
+        return {code: 0.0 for code in codes}
+    return measure_pack_sizes(install_dir, codes, on_size=on_size)
+
+
+def measure_pack_sizes(
+    install_dir: Path,
+    codes: set[str],
+    cache_path: Path | None = None,
+    on_size: Callable[[str, float, int, int], None] | None = None,
+) -> Dict[str, float]:
     sizes = {code: 0.0 for code in codes}
-    if GAME_INSTALL_DIR is None:
-        return sizes
-    for code in codes:
-        folder = GAME_INSTALL_DIR / code
-        if not folder.exists() or not folder.is_dir():
-            continue
-        sizes[code] = round(_directory_size_bytes(folder) / BYTES_PER_GIB, 2)
+    cached = _read_pack_size_cache(install_dir, cache_path)
+    packs = dict(cached)
+    completed = 0
+    # concurrent.futures pulls in logging; keep it off the CLI start path.
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    with ThreadPoolExecutor(max_workers=PACK_SCAN_WORKERS) as pool:
+        futures = {
+            pool.submit(_measure_pack, install_dir / code, cached.get(code)): code
+            for code in sorted(codes)
+        }
+        for future in as_completed(futures):
+            code = futures[future]
+            entry = future.result()
+            if entry is None:
+                packs.pop(code, None)
+            else:
+                packs[code] = entry
+                sizes[code] = round(entry["bytes"] / BYTES_PER_GIB, 2)
+            completed += 1
+            if on_size is not None:
+                on_size(code, sizes[code], completed, len(futures))
+    if packs != cached:
+        _write_pack_size_cache(install_dir, packs, cache_path)
     return sizes
 
 
@@ -194,62 +552,108 @@ def apply_pack_sizes(categories: List[Dict]) -> None:
             item["size_gb"] = get_pack_size_gb(item["code"], item.get("size_gb"))
 
 
+def _parse_checklist_line(raw_line: str) -> Tuple | None:
+    # ("end",) for the Output heading, ("title", title) for a category and
+    # ("item", code, name, enabled, size_gb | None) for a checkbox line.
+    line = raw_line.strip()
+    if not line:
+        return None
+    if line.startswith("## Output"):
+        return ("end",)
+    if line.startswith("## "):
+        return ("title", line[3:].strip())
+    if not line.startswith("- ["):
+        return None
+    marker = line[3:6]
+    enabled = "x" in marker.lower()
+    try:
+        remainder = line.split("] ", 1)[1]
+        code, name = remainder.split(" - ", 1)
+    except ValueError:
+        return None
+    normalized_name, parsed_size = _parse_name_and_size(name.strip())
+    return ("item", code.strip().upper(), normalized_name, enabled, parsed_size)
+
+
 def parse_checklist(markdown: str) -> List[Dict]:
     categories: List[Dict] = []
     current: Dict | None = None
     for raw_line in markdown.splitlines():
-        line = raw_line.strip()
-        if not line:
+        entry = _parse_checklist_line(raw_line)
+        if entry is None:
             continue
-        if line.startswith("## Output"):
+        kind = entry[0]
+        if kind == "end":
             break
-        if line.startswith("## "):
-            current = {"title": line[3:].strip(), "items": []}
+        if kind == "title":
+            current = {"title": entry[1], "items": []}
             categories.append(current)
             continue
-        if line.startswith("#"):
-            continue
-        if not line.startswith("- ["):
-            continue
         if current is None:
             continue
-        marker = line[3:6]
-        enabled = "x" in marker.lower()
-        try:
-            remainder = line.split("] ", 1)[1]
-            code, name = remainder.split(" - ", 1)
-        except ValueError:
-            continue
-        normalized_code = code.strip().upper()
-        normalized_name, parsed_size = _parse_name_and_size(name.strip())
-        item = {
-            "code": normalized_code,
-            "name": normalized_name,
-            "enabled": enabled,
-            "size_gb": get_pack_size_gb(normalized_code, parsed_size),
-        }
-        current["items"].append(item)
+        _kind, code, name, enabled, parsed_size = entry
+        current["items"].append(
+            {
+                "code": code,
+                "name": name,
+                "enabled": enabled,
+                "size_gb": get_pack_size_gb(code, parsed_size),
+            }
+        )
     return categories
 
 
-DEFAULT_CATEGORIES = parse_checklist(RAW_CHECKLIST)
-PACK_SIZE_GB = load_pack_sizes(
-    {
-        item["code"]
-        for category in DEFAULT_CATEGORIES
+@run_once
+def get_default_categories() -> List[Dict]:
+    categories = parse_checklist(get_raw_checklist())
+    PACK_SIZE_GB.update(
+        load_cached_pack_sizes(
+            {item["code"] for category in categories for item in category["items"]}
+        )
+    )
+    apply_pack_sizes(categories)
+    return categories
+
+
+@run_once
+def get_default_code_to_category() -> Dict[str, str]:
+    return {
+        item["code"]: category["title"]
+        for category in get_default_categories()
         for item in category["items"]
     }
-)
-apply_pack_sizes(DEFAULT_CATEGORIES)
-DEFAULT_CODE_TO_CATEGORY = {
-    item["code"]: category["title"]
-    for category in DEFAULT_CATEGORIES
-    for item in category["items"]
-}
+
+
 STATE_LOCK = Lock()
-_state_categories: List[Dict] = []
-_code_index: Dict[str, Dict] = {}
+STATE_CHANGED = Condition(STATE_LOCK)
+_state: "PackState | None" = None
 _launcher_mtime: float | None = None
+_launcher_watch_active = False
+_state_version = 0
+# (version, changed codes); None marks a structural change that needs a full payload.
+_change_log: Deque[Tuple[int, frozenset[str] | None]] = deque(maxlen=STATE_CHANGE_LOG_LIMIT)
+_aggregates_cache: Dict | None = None
+_markdown_cache: Tuple[int, str] | None = None
+_payload_cache: Dict | None = None
+STATE_MD_LOCK = Lock()
+# Lines and (mtime_ns, size) of the state.md content last read or written,
+# so a reload can diff against it instead of re-parsing the whole file.
+_state_md_lines: List[str] | None = None
+_state_md_signature: Tuple[int, int] | None = None
+# After a start-up from the snapshot, the state that state.md was exported
+# from; its lines are rendered on the first reload instead of at start-up.
+_state_md_exported: "PackState | None" = None
+JOURNAL_LOCK = Lock()
+JOURNAL_SYNC_LOCK = Lock()
+_journal_handle: BinaryIO | None = None
+_journal_seq = 0
+# (sequence, encoded line) of records not yet folded into the snapshot.
+_journal_tail: List[Tuple[int, bytes]] = []
+_journal_unsynced = False
+_journal_synced_at = 0.0
+# Reversible changes (codes enabled, codes disabled), newest last.
+_undo_history: Deque[Dict] = deque(maxlen=JOURNAL_UNDO_LIMIT)
+_redo_history: List[Dict] = []
 
 
 def flatten_items(categories: List[Dict]) -> List[Dict]:
@@ -266,6 +670,12 @@ def extract_disable_argument(raw_text: str) -> str | None:
 
 
 def parse_disable_argument(argument: str) -> Tuple[str, List[str]]:
+    canonical, codes = _parse_disable_argument(argument)
+    return canonical, list(codes)
+
+
+@lru_cache(maxsize=64)
+def _parse_disable_argument(argument: str) -> Tuple[str, Tuple[str, ...]]:
     if not argument:
         raise ValueError("Disable argument cannot be empty.")
     text = argument.strip()
@@ -273,11 +683,11 @@ def parse_disable_argument(argument: str) -> Tuple[str, List[str]]:
     if prefix_index == -1:
         raise ValueError("Disable argument must include '-disablepacks:' prefix.")
     codes_part = text[prefix_index + len(DISABLE_PREFIX) :]
-    codes = [
+    codes = tuple(
         code.strip().upper()
         for code in codes_part.split(",")
         if code.strip()
-    ]
+    )
     canonical = DISABLE_PREFIX + ",".join(codes)
     return canonical, codes
 
@@ -287,8 +697,9 @@ def is_pack_code(code: str) -> bool:
 
 
 def infer_category_for_code(code: str) -> str:
-    if code in DEFAULT_CODE_TO_CATEGORY:
-        return DEFAULT_CODE_TO_CATEGORY[code]
+    default_code_to_category = get_default_code_to_category()
+    if code in default_code_to_category:
+        return default_code_to_category[code]
     if code.startswith("EP"):
         return "Expansion Packs"
     if code.startswith("GP"):
@@ -312,11 +723,6 @@ def infer_name_for_code(code: str) -> str:
     return f"Unknown Pack ({code})"
 
 
-def rebuild_code_index() -> None:
-    global _code_index
-    _code_index = build_code_index(_state_categories)
-
-
 def merge_categories_with_defaults(categories: List[Dict]) -> List[Dict]:
     existing_by_code = {
         item["code"]: item
@@ -324,7 +730,7 @@ def merge_categories_with_defaults(categories: List[Dict]) -> List[Dict]:
     }
     merged: List[Dict] = []
     seen_codes: set[str] = set()
-    for default_category in DEFAULT_CATEGORIES:
+    for default_category in get_default_categories():
         merged_items: List[Dict] = []
         for default_item in default_category["items"]:
             code = default_item["code"]
@@ -342,7 +748,7 @@ def merge_categories_with_defaults(categories: List[Dict]) -> List[Dict]:
                     }
                 )
             else:
-                merged_items.append(copy.deepcopy(default_item))
+                merged_items.append(dict(default_item))
         merged.append({"title": default_category["title"], "items": merged_items})
     for category in categories:
         extras = [item for item in category["items"] if item["code"] not in seen_codes]
@@ -351,37 +757,24 @@ def merge_categories_with_defaults(categories: List[Dict]) -> List[Dict]:
         title = category["title"]
         target = next((entry for entry in merged if entry["title"] == title), None)
         if target is None:
-            merged.append({"title": title, "items": copy.deepcopy(extras)})
+            merged.append({"title": title, "items": [dict(item) for item in extras]})
         else:
-            target["items"].extend(copy.deepcopy(extras))
+            target["items"].extend(dict(item) for item in extras)
     return merged
 
 
-def add_missing_codes(codes: set[str], *, enabled: bool) -> bool:
-    changed = False
-    if not codes:
-        return changed
-    existing_codes = set(_code_index.keys())
-    category_lookup = {category["title"]: category for category in _state_categories}
-    for code in sorted(codes):
-        if code in existing_codes:
-            continue
-        title = infer_category_for_code(code)
-        if title not in category_lookup:
-            category_lookup[title] = {"title": title, "items": []}
-            _state_categories.append(category_lookup[title])
-        category_lookup[title]["items"].append(
-            {
-                "code": code,
-                "name": infer_name_for_code(code),
-                "enabled": enabled,
-                "size_gb": get_pack_size_gb(code),
-            }
-        )
-        changed = True
-    if changed:
-        rebuild_code_index()
-    return changed
+def add_missing_codes(codes: Iterable[str], *, enabled: bool) -> Tuple[str, ...]:
+    global _state
+    if not codes or _state is None:
+        return ()
+    _mask, unknown = _state.catalogue.mask_for_codes(tuple(codes))
+    if not unknown:
+        return ()
+    expanded = _state.with_added_codes(set(unknown), enabled=enabled)
+    if expanded is None:
+        return ()
+    _state = expanded
+    return unknown
 
 
 def build_disable_argument(categories: List[Dict]) -> str:
@@ -393,36 +786,48 @@ def build_disable_argument(categories: List[Dict]) -> str:
     return "-disablepacks:" + ",".join(disabled_codes)
 
 
-def apply_disabled_codes(disabled_codes: set[str]) -> bool:
-    changed = False
-    flat_items = flatten_items(_state_categories)
-    for item in flat_items:
-        next_enabled = item["code"] not in disabled_codes
-        if item.get("enabled", False) != next_enabled:
-            item["enabled"] = next_enabled
-            changed = True
-    return changed
+def apply_disabled_codes(disabled_codes: Iterable[str]) -> List[str]:
+    if _state is None:
+        return []
+    return _state.apply_disabled(disabled_codes)
 
 
-def generate_markdown(categories: List[Dict]) -> str:
+def _render_markdown(
+    sections: Iterable[Tuple[str, Iterable[Tuple[bool, str, str, float]]]],
+    disable_argument: str,
+) -> str:
     lines: List[str] = ["# The Sims 4 DLC - Checklist", ""]
-    for category in categories:
-        lines.append(f"## {category['title']}")
+    for title, rows in sections:
+        lines.append(f"## {title}")
         lines.append("")
-        for item in category["items"]:
-            mark = "x" if item.get("enabled", False) else " "
-            size_gb = get_pack_size_gb(item["code"], item.get("size_gb"))
-            lines.append(f"- [{mark}] {item['code']} - {item['name']} [{size_gb:.2f} GB]")
+        for enabled, code, name, size_gb in rows:
+            mark = "x" if enabled else " "
+            lines.append(f"- [{mark}] {code} - {name} [{size_gb:.2f} GB]")
         lines.append("")
     lines.append("## Output")
     lines.append("")
-    lines.append(build_disable_argument(categories))
+    lines.append(disable_argument)
     lines.append("")
     return "\n".join(lines)
 
 
-def build_code_index(categories: List[Dict]) -> Dict[str, Dict]:
-    return {item["code"]: item for item in flatten_items(categories)}
+def generate_markdown(categories: List[Dict]) -> str:
+    sections = (
+        (
+            category["title"],
+            (
+                (
+                    item.get("enabled", False),
+                    item["code"],
+                    item["name"],
+                    get_pack_size_gb(item["code"], item.get("size_gb")),
+                )
+                for item in category["items"]
+            ),
+        )
+        for category in categories
+    )
+    return _render_markdown(sections, build_disable_argument(categories))
 
 
 def summarize_storage(categories: List[Dict]) -> Dict[str, float]:
@@ -434,6 +839,10 @@ def summarize_storage(categories: List[Dict]) -> Dict[str, float]:
             enabled_gb += size_gb
         else:
             disabled_gb += size_gb
+    return _storage_summary(enabled_gb, disabled_gb)
+
+
+def _storage_summary(enabled_gb: float, disabled_gb: float) -> Dict[str, float]:
     total_gb = enabled_gb + disabled_gb
     return {
         "enabledGB": round(enabled_gb, 2),
@@ -442,24 +851,480 @@ def summarize_storage(categories: List[Dict]) -> Dict[str, float]:
     }
 
 
+INVERT_FLAGS = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+NONZERO_BYTE_REGEX = re.compile(rb"[^\x00]")
+MASK_CACHE_LIMIT = 64
+
+
+def _little_endian_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _little_endian_array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _mask_from_slots(slots: Iterable[int], size: int) -> int:
+    bits = bytearray((size + 7) // 8)
+    for slot in slots:
+        bits[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _iter_set_bits(mask: int) -> Iterator[int]:
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    for match in NONZERO_BYTE_REGEX.finditer(data):
+        base = match.start() * 8
+        byte = data[match.start()]
+        while byte:
+            low = byte & -byte
+            yield base + low.bit_length() - 1
+            byte ^= low
+
+
+class PackRecord:
+    """One catalogue entry; records are shared and never modified once built."""
+
+    __slots__ = ("code", "name", "size_gb")
+
+    def __init__(self, code: str, name: str, size_gb: float) -> None:
+        self.code = code
+        self.name = name
+        self.size_gb = size_gb
+
+
+class PackCatalogue:
+    """Ordered pack records grouped by category, with a code-to-slot index."""
+
+    __slots__ = (
+        "titles", "records", "ranges", "codes", "slots", "pack_code_flags", "mask_cache", "_encoded"
+    )
+
+    def __init__(self, titles: List[str], grouped: List[List[PackRecord]]) -> None:
+        records: List[PackRecord] = []
+        ranges: List[Tuple[int, int]] = []
+        for group in grouped:
+            start = len(records)
+            records.extend(group)
+            ranges.append((start, len(records)))
+        self.titles: Tuple[str, ...] = tuple(titles)
+        self.records: Tuple[PackRecord, ...] = tuple(records)
+        self.ranges: Tuple[Tuple[int, int], ...] = tuple(ranges)
+        self.codes: Tuple[str, ...] = tuple(record.code for record in records)
+        self.slots: Dict[str, int] = {code: slot for slot, code in enumerate(self.codes)}
+        self.pack_code_flags = bytes(is_pack_code(code) for code in self.codes)
+        self.mask_cache: Dict[Tuple[str, ...], Tuple[int, Tuple[str, ...]]] = {}
+        self._encoded: Tuple[bytes, bytes] | None = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def matches(self, categories: List[Dict]) -> bool:
+        if len(categories) != len(self.titles):
+            return False
+        records = self.records
+        for title, (start, end), category in zip(self.titles, self.ranges, categories):
+            items = category["items"]
+            if category["title"] != title or len(items) != end - start:
+                return False
+            for record, item in zip(records[start:end], items):
+                if record.code != item["code"] or record.name != item["name"]:
+                    return False
+        return True
+
+    def encoded(self) -> Tuple[bytes, bytes]:
+        # Snapshot form: titles then code/name pairs as one NUL-separated
+        # string table, and the end slot of every category.
+        if self._encoded is None:
+            strings = "\0".join(
+                chain(
+                    self.titles,
+                    chain.from_iterable((record.code, record.name) for record in self.records),
+                )
+            )
+            ends = array("I", (end for _start, end in self.ranges))
+            self._encoded = (strings.encode("utf-8"), _little_endian_bytes(ends))
+        return self._encoded
+
+    def mask_for_codes(self, codes: Tuple[str, ...]) -> Tuple[int, Tuple[str, ...]]:
+        # One pass over the code table; codes outside the catalogue are
+        # returned separately so the caller can add them first.
+        cached = self.mask_cache.get(codes)
+        if cached is not None:
+            return cached
+        slots = self.slots
+        bits = bytearray((len(slots) + 7) // 8)
+        unknown: List[str] = []
+        for code in codes:
+            slot = slots.get(code)
+            if slot is None:
+                unknown.append(code)
+            else:
+                bits[slot >> 3] |= 1 << (slot & 7)
+        result = (int.from_bytes(bits, "little"), tuple(unknown))
+        if len(self.mask_cache) >= MASK_CACHE_LIMIT:
+            self.mask_cache.clear()
+        self.mask_cache[codes] = result
+        return result
+
+
+class PackState:
+    """Per-pack enabled flags and measured sizes over a catalogue, one slot per pack."""
+
+    __slots__ = ("catalogue", "enabled", "sizes", "disabled_mask", "_argument_cache", "_items")
+
+    def __init__(
+        self,
+        catalogue: PackCatalogue,
+        enabled: bytearray | None = None,
+        sizes: "array[float] | None" = None,
+        *,
+        disabled_mask: int | None = None,
+        items: "List[Dict | None] | None" = None,
+    ) -> None:
+        self.catalogue = catalogue
+        self.enabled = enabled if enabled is not None else bytearray(len(catalogue))
+        self.sizes = sizes if sizes is not None else array(
+            "d",
+            (get_pack_size_gb(record.code, record.size_gb) for record in catalogue.records),
+        )
+        if disabled_mask is None:
+            disabled = self.enabled.translate(INVERT_FLAGS)
+            disabled_mask = _mask_from_slots(compress(range(len(disabled)), disabled), len(disabled))
+        self.disabled_mask = disabled_mask
+        self._argument_cache: Tuple[int, str] | None = None
+        # Materialised item dicts, shared by every payload and copy until the
+        # slot changes; callers treat them as read-only.
+        self._items: List[Dict | None] = items if items is not None else [None] * len(catalogue)
+
+    @classmethod
+    def from_categories(
+        cls, categories: List[Dict], template: "PackState | None" = None
+    ) -> "PackState":
+        if template is not None and template.catalogue.matches(categories):
+            items = [item for category in categories for item in category["items"]]
+            return cls(
+                template.catalogue,
+                bytearray(bool(item.get("enabled", False)) for item in items),
+                array(
+                    "d",
+                    (
+                        get_pack_size_gb(item["code"], float(item.get("size_gb") or 0.0))
+                        for item in items
+                    ),
+                ),
+            )
+        titles: List[str] = []
+        grouped: List[List[PackRecord]] = []
+        enabled = bytearray()
+        for category in categories:
+            titles.append(category["title"])
+            grouped.append(
+                [
+                    PackRecord(
+                        item["code"],
+                        item["name"],
+                        float(item.get("size_gb") or 0.0),
+                    )
+                    for item in category["items"]
+                ]
+            )
+            enabled.extend(bool(item.get("enabled", False)) for item in category["items"])
+        return cls(PackCatalogue(titles, grouped), enabled)
+
+    def copy(self) -> "PackState":
+        # Shares the catalogue and materialised items; only the flag and size
+        # arrays are duplicated.
+        return PackState(
+            self.catalogue,
+            bytearray(self.enabled),
+            array("d", self.sizes),
+            disabled_mask=self.disabled_mask,
+            items=list(self._items),
+        )
+
+    def item(self, slot: int) -> Dict:
+        item = self._items[slot]
+        if item is None:
+            record = self.catalogue.records[slot]
+            item = {
+                "code": record.code,
+                "name": record.name,
+                "enabled": bool(self.enabled[slot]),
+                "size_gb": self.sizes[slot],
+            }
+            self._items[slot] = item
+        return item
+
+    def to_categories(self) -> List[Dict]:
+        return [
+            {"title": title, "items": [self.item(slot) for slot in range(start, end)]}
+            for title, (start, end) in zip(self.catalogue.titles, self.catalogue.ranges)
+        ]
+
+    def set_enabled(self, code: str, enabled: bool) -> bool:
+        slot = self.catalogue.slots[code]
+        if self.enabled[slot] == enabled:
+            return False
+        self.enabled[slot] = enabled
+        self.disabled_mask ^= 1 << slot
+        self._items[slot] = None
+        return True
+
+    def set_size(self, code: str, size_gb: float) -> bool:
+        slot = self.catalogue.slots.get(code)
+        if slot is None or self.sizes[slot] == size_gb:
+            return False
+        self.sizes[slot] = size_gb
+        self._items[slot] = None
+        return True
+
+    def apply_disabled(self, disabled_codes: Iterable[str]) -> List[str]:
+        mask, _unknown = self.catalogue.mask_for_codes(tuple(disabled_codes))
+        return self.apply_disabled_mask(mask)
+
+    def apply_disabled_mask(self, mask: int) -> List[str]:
+        flipped = self.disabled_mask ^ mask
+        if not flipped:
+            return []
+        codes = self.catalogue.codes
+        changed: List[str] = []
+        items = self._items
+        for slot in _iter_set_bits(flipped):
+            self.enabled[slot] ^= 1
+            items[slot] = None
+            changed.append(codes[slot])
+        self.disabled_mask = mask
+        return changed
+
+    def disabled_codes(self) -> List[str]:
+        disabled = self.enabled.translate(INVERT_FLAGS)
+        return list(
+            compress(
+                compress(self.catalogue.codes, disabled),
+                compress(self.catalogue.pack_code_flags, disabled),
+            )
+        )
+
+    def disable_argument(self) -> str:
+        cached = self._argument_cache
+        if cached is not None and cached[0] == self.disabled_mask:
+            return cached[1]
+        argument = DISABLE_PREFIX + ",".join(self.disabled_codes())
+        self._argument_cache = (self.disabled_mask, argument)
+        return argument
+
+    def storage(self) -> Dict[str, float]:
+        enabled_gb = sum(compress(self.sizes, self.enabled))
+        disabled_gb = sum(compress(self.sizes, self.enabled.translate(INVERT_FLAGS)))
+        return _storage_summary(enabled_gb, disabled_gb)
+
+    def storage_for_mask(self, mask: int) -> Dict[str, float]:
+        sizes = self.sizes
+        disabled_gb = sum(sizes[slot] for slot in _iter_set_bits(mask))
+        return _storage_summary(sum(sizes) - disabled_gb, disabled_gb)
+
+    def markdown(self) -> str:
+        records = self.catalogue.records
+        sections = (
+            (
+                title,
+                (
+                    (
+                        bool(self.enabled[slot]),
+                        records[slot].code,
+                        records[slot].name,
+                        self.sizes[slot],
+                    )
+                    for slot in range(start, end)
+                ),
+            )
+            for title, (start, end) in zip(self.catalogue.titles, self.catalogue.ranges)
+        )
+        return _render_markdown(sections, self.disable_argument())
+
+    def with_added_codes(self, codes: set[str], *, enabled: bool) -> "PackState | None":
+        missing = sorted(code for code in codes if code not in self.catalogue.slots)
+        if not missing:
+            return None
+        catalogue = self.catalogue
+        titles = list(catalogue.titles)
+        grouped = [
+            [
+                PackRecord(record.code, record.name, self.sizes[slot])
+                for slot, record in enumerate(catalogue.records[start:end], start)
+            ]
+            for start, end in catalogue.ranges
+        ]
+        flags = {code: bool(self.enabled[slot]) for slot, code in enumerate(catalogue.codes)}
+        for code in missing:
+            title = infer_category_for_code(code)
+            if title not in titles:
+                titles.append(title)
+                grouped.append([])
+            index = titles.index(title)
+            grouped[index].append(
+                PackRecord(code, infer_name_for_code(code), get_pack_size_gb(code))
+            )
+            flags[code] = enabled
+        expanded = PackCatalogue(titles, grouped)
+        return PackState(
+            expanded,
+            bytearray(flags[code] for code in expanded.codes),
+            array("d", (record.size_gb for record in expanded.records)),
+        )
+
+
+@run_once
+def get_default_pack_state() -> PackState:
+    # The default checklist as a template: never mutated apart from measured
+    # sizes, so resets and merged loads can share its catalogue and items.
+    template = PackState.from_categories(get_default_categories())
+    template.to_categories()
+    return template
+
+
+def encode_state_snapshot(
+    state: PackState, exported: Tuple[int, int] | None, journal_seq: int = 0
+) -> bytes:
+    strings, ends = state.catalogue.encoded()
+    mtime_ns, size = exported if exported is not None else (-1, -1)
+    header = STATE_SNAPSHOT_HEADER.pack(
+        STATE_SNAPSHOT_MAGIC,
+        STATE_SNAPSHOT_VERSION,
+        mtime_ns,
+        size,
+        journal_seq,
+        len(state.catalogue.titles),
+        len(state.catalogue),
+        len(strings),
+    )
+    return b"".join((header, strings, ends, bytes(state.enabled), _little_endian_bytes(state.sizes)))
+
+
+def _catalogue_from_snapshot(
+    strings: bytes, ends: "array[int]", record_sizes: "array[float]"
+) -> PackCatalogue | None:
+    try:
+        fields = strings.decode("utf-8").split("\0") if strings else []
+    except UnicodeDecodeError:
+        return None
+    title_count = len(ends)
+    if len(fields) != title_count + 2 * len(record_sizes):
+        return None
+    codes = fields[title_count::2]
+    names = fields[title_count + 1::2]
+    grouped: List[List[PackRecord]] = []
+    start = 0
+    for end in ends:
+        if not start <= end <= len(codes):
+            return None
+        grouped.append(
+            [PackRecord(codes[slot], names[slot], record_sizes[slot]) for slot in range(start, end)]
+        )
+        start = end
+    if start != len(codes):
+        return None
+    return PackCatalogue(fields[:title_count], grouped)
+
+
+def read_state_snapshot(
+    path: Path | None = None,
+) -> Tuple[PackState, Tuple[int, int] | None, int] | None:
+    # One read and a few slices; the string table is only decoded when the
+    # catalogue differs from the defaults.
+    try:
+        data = (path or STATE_SNAPSHOT).read_bytes()
+    except OSError:
+        return None
+    header = STATE_SNAPSHOT_HEADER
+    if len(data) < header.size:
+        return None
+    (
+        magic,
+        version,
+        mtime_ns,
+        md_size,
+        journal_seq,
+        title_count,
+        record_count,
+        strings_length,
+    ) = header.unpack_from(data)
+    if magic != STATE_SNAPSHOT_MAGIC or version != STATE_SNAPSHOT_VERSION:
+        return None
+    sections: List[bytes] = []
+    offset = header.size
+    for length in (strings_length, 4 * title_count, record_count, 8 * record_count):
+        sections.append(data[offset:offset + length])
+        offset += length
+    if offset != len(data):
+        return None
+    strings, ends, enabled, sizes = sections
+    if enabled.translate(None, b"\x00\x01"):
+        return None
+    sizes_array = _little_endian_array("d", sizes)
+    template = get_default_pack_state()
+    if (strings, ends) == template.catalogue.encoded():
+        catalogue = template.catalogue
+    else:
+        catalogue = _catalogue_from_snapshot(strings, _little_endian_array("I", ends), sizes_array)
+        if catalogue is None:
+            return None
+    exported = (mtime_ns, md_size) if mtime_ns >= 0 else None
+    return PackState(catalogue, bytearray(enabled), sizes_array), exported, journal_seq
+
+
+def write_state_snapshot(
+    state: PackState, exported: Tuple[int, int] | None, journal_seq: int
+) -> None:
+    atomic_write_bytes(STATE_SNAPSHOT, encode_state_snapshot(state, exported, journal_seq))
+
+
+def _file_signature(path: Path) -> Tuple[int, int] | None:
+    try:
+        stat_result = path.stat()
+    except OSError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+def _remember_state_markdown(text: str, signature: Tuple[int, int] | None) -> None:
+    global _state_md_lines, _state_md_signature, _state_md_exported
+    with STATE_MD_LOCK:
+        _state_md_lines = text.splitlines()
+        _state_md_signature = signature
+        _state_md_exported = None
+
+
+def write_state_markdown(markdown: str) -> None:
+    atomic_write_text(STATE_MD, markdown)
+    _remember_state_markdown(markdown, _file_signature(STATE_MD))
+
+
+@traced
 def persist_state(
     categories: List[Dict], *, write_state: bool = True
 ) -> Tuple[str, str]:
     markdown = generate_markdown(categories)
     disable_arg = build_disable_argument(categories)
     if write_state:
-        STATE_MD.write_text(markdown, encoding="utf-8")
+        write_state_markdown(markdown)
     return markdown, disable_arg
 
 
-def sync_launcher_argument(disable_argument: str) -> None:
-    global _launcher_mtime
-    if not disable_argument or not str(LAUNCHER_BAT):
-        return
+def write_launcher_argument(launcher_bat: Path, disable_argument: str) -> bool:
+    # Returns True when the launcher file was rewritten.
     try:
-        content = LAUNCHER_BAT.read_text(encoding="utf-8", errors="ignore")
+        content = launcher_bat.read_text(encoding="utf-8", errors="ignore")
     except OSError:
-        return
+        return False
     newline = "\r\n" if "\r\n" in content else "\n"
     normalized = content.replace("\r\n", "\n")
     updated, count = DISABLE_REGEX.subn(disable_argument, normalized, count=1)
@@ -477,31 +1342,242 @@ def sync_launcher_argument(disable_argument: str) -> None:
             lines.append(f"set ARGS={disable_argument}")
         updated = "\n".join(lines)
     if updated == normalized:
-        return
+        return False
     updated = updated.replace("\n", newline)
     try:
-        LAUNCHER_BAT.write_text(updated, encoding="utf-8")
+        atomic_write_text(launcher_bat, updated)
     except OSError:
+        return False
+    return True
+
+
+@traced
+def sync_launcher_argument(disable_argument: str) -> None:
+    global _launcher_mtime
+    launcher_bat = get_launcher_path()
+    if not disable_argument or not str(launcher_bat):
+        return
+    if not write_launcher_argument(launcher_bat, disable_argument):
         return
     try:
-        _launcher_mtime = LAUNCHER_BAT.stat().st_mtime
+        _launcher_mtime = launcher_bat.stat().st_mtime
     except OSError:
         _launcher_mtime = None
 
 
+class WriteBehindWriter:
+    """Coalesces state changes; syncs the launcher and compacts the journal on a worker thread."""
+
+    def __init__(
+        self,
+        delay: float = PERSIST_DELAY_SECONDS,
+        max_delay: float = PERSIST_MAX_DELAY_SECONDS,
+        export_interval: float = STATE_EXPORT_INTERVAL_SECONDS,
+    ) -> None:
+        self.delay = delay
+        self.max_delay = max_delay
+        self.export_interval = export_interval
+        self._condition = Condition()
+        self._write_lock = Lock()
+        self._thread: Thread | None = None
+        self._write_state = False
+        self._sync_launcher = False
+        self._export_pending = False
+        self._first_dirty = 0.0
+        self._deadline = 0.0
+        self._next_export = 0.0
+
+    @property
+    def dirty(self) -> bool:
+        return self._write_state or self._sync_launcher
+
+    @property
+    def pending(self) -> bool:
+        return self.dirty or self._export_pending
+
+    def schedule(self, *, write_state: bool = True, sync_launcher: bool = True) -> None:
+        if not write_state and not sync_launcher:
+            return
+        now = time.monotonic()
+        with self._condition:
+            if not self.dirty:
+                self._first_dirty = now
+            self._write_state = self._write_state or write_state
+            self._sync_launcher = self._sync_launcher or sync_launcher
+            self._deadline = min(now + self.delay, self._first_dirty + self.max_delay)
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="state-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        with self._write_lock:
+            yield
+
+    @traced
+    def flush(self, *, lazy: bool = False) -> None:
+        # Changes are already in the journal, so a lazy pass only syncs the
+        # launcher; compaction (state.md export plus snapshot) runs at most
+        # once per export interval unless the journal grows long.
+        with self._write_lock:
+            with self._condition:
+                sync_launcher = self._sync_launcher
+                compact = self._write_state or self._export_pending
+                self._write_state = False
+                self._sync_launcher = False
+                self._export_pending = False
+                if (
+                    compact
+                    and lazy
+                    and time.monotonic() < self._next_export
+                    and len(_journal_tail) < JOURNAL_COMPACT_RECORDS
+                ):
+                    self._export_pending = True
+                    self._deadline = self._next_export
+                    compact = False
+            sync_journal()
+            if not sync_launcher and not compact:
+                return
+            with STATE_LOCK:
+                if _state is None:
+                    return
+                markdown = _state.markdown() if compact else None
+                disable_arg = _state.disable_argument() if sync_launcher else None
+                snapshot = _state.copy() if compact else None
+                journal_seq = _journal_seq
+            # The launcher goes first: once the journal is truncated, a crash
+            # must not leave it behind the snapshot.
+            if disable_arg is not None:
+                sync_launcher_argument(disable_arg)
+            if snapshot is not None:
+                write_state_markdown(markdown)
+                _compact_journal(snapshot, journal_seq)
+                with self._condition:
+                    self._next_export = time.monotonic() + self.export_interval
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self.pending:
+                    self._condition.wait()
+                remaining = self._deadline - time.monotonic()
+                while self.pending and remaining > 0:
+                    self._condition.wait(remaining)
+                    remaining = self._deadline - time.monotonic()
+            try:
+                self.flush(lazy=True)
+            except OSError:
+                continue
+
+
+def _compact_journal(state: PackState, journal_seq: int) -> None:
+    with STATE_MD_LOCK:
+        exported = _state_md_signature
+    write_state_snapshot(state, exported, journal_seq)
+    with STATE_LOCK:
+        _truncate_journal_locked(journal_seq)
+
+
+STATE_WRITER = WriteBehindWriter()
+
+
+def schedule_persist(*, write_state: bool = True, sync_launcher: bool = True) -> None:
+    # Every change calls this after releasing STATE_LOCK, so the journal is
+    # synced here rather than while other threads wait on the lock.
+    _sync_journal_for_policy()
+    STATE_WRITER.schedule(write_state=write_state, sync_launcher=sync_launcher)
+
+
+def flush_pending_writes() -> None:
+    STATE_WRITER.flush()
+
+
+atexit.register(flush_pending_writes)
+
+
+def launcher_needs_polling(path: Path) -> bool:
+    # File system notifications do not cross the WSL drive bridge or reach
+    # network shares reliably, so those launchers are polled instead.
+    text = str(path).replace("\\", "/")
+    if FORCE_LAUNCHER_POLLING or text.startswith("//"):
+        return True
+    return bool(re.match(r"/mnt/[a-z]/", text, re.IGNORECASE))
+
+
+def launcher_changed_on_disk() -> bool:
+    try:
+        mtime = get_launcher_path().stat().st_mtime
+    except OSError:
+        return False
+    return _launcher_mtime is None or mtime > _launcher_mtime
+
+
+def set_launcher_watch_active(active: bool) -> None:
+    global _launcher_watch_active
+    _launcher_watch_active = active
+
+
+class LauncherPoller:
+    """Polls the launcher file where file system notifications are unreliable."""
+
+    def __init__(
+        self,
+        path: Path,
+        on_change: Callable[[], None],
+        interval: float = LAUNCHER_POLL_SECONDS,
+    ) -> None:
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._stopped = Event()
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = Thread(target=self._run, name="launcher-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _signature(self) -> Tuple[int, int] | None:
+        try:
+            stat_result = self.path.stat()
+        except OSError:
+            return None
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    def _run(self) -> None:
+        last = self._signature()
+        while not self._stopped.wait(self.interval):
+            current = self._signature()
+            if current != last:
+                last = current
+                try:
+                    self.on_change()
+                except Exception as error:
+                    # A malformed file must not stop the watch; report it and
+                    # try again on the next change.
+                    print(f"Could not reload {self.path.name}: {error!r}", file=sys.stderr)
+
+
+@traced
 def sync_state_from_launcher(force: bool = False) -> bool:
     global _launcher_mtime
-    if not str(LAUNCHER_BAT):
+    launcher_bat = get_launcher_path()
+    if not str(launcher_bat):
         return False
     try:
-        stat_result = LAUNCHER_BAT.stat()
+        stat_result = launcher_bat.stat()
     except OSError:
         _launcher_mtime = None
         return False
     if not force and _launcher_mtime is not None and stat_result.st_mtime <= _launcher_mtime:
         return False
     try:
-        content = LAUNCHER_BAT.read_text(encoding="utf-8", errors="ignore")
+        content = launcher_bat.read_text(encoding="utf-8", errors="ignore")
     except OSError:
         _launcher_mtime = stat_result.st_mtime
         return False
@@ -509,287 +1585,1082 @@ def sync_state_from_launcher(force: bool = False) -> bool:
     if not argument:
         _launcher_mtime = stat_result.st_mtime
         return False
-    _, codes = parse_disable_argument(argument)
-    disabled_codes = set(codes)
+    _, codes = _parse_disable_argument(argument)
     with STATE_LOCK:
-        if not _state_categories:
+        if _state is None:
             _launcher_mtime = stat_result.st_mtime
             return False
-        changed = add_missing_codes(disabled_codes, enabled=False)
-        changed = apply_disabled_codes(disabled_codes) or changed
-        if changed:
-            persist_state(_state_categories, write_state=True)
+        added = add_missing_codes(codes, enabled=False)
+        flipped = apply_disabled_codes(codes)
+        if added:
+            _record_change_locked(None)
+        elif flipped:
+            _record_change_locked(flipped)
+        _journal_change_locked("launcher", flipped, added)
+        changed = bool(added) or bool(flipped)
+    if changed:
+        schedule_persist(sync_launcher=False)
     _launcher_mtime = stat_result.st_mtime
     return changed
 
 
-def ensure_output_files() -> None:
-    DEFAULT_MD.write_text(generate_markdown(DEFAULT_CATEGORIES), encoding="utf-8")
-
-    if STATE_MD.exists():
-        parsed = parse_checklist(STATE_MD.read_text(encoding="utf-8"))
-        apply_pack_sizes(parsed)
-        if parsed:
-            target = merge_categories_with_defaults(parsed)
-        else:
-            target = copy.deepcopy(DEFAULT_CATEGORIES)
-        persist_state(target, write_state=True)
-    else:
-        persist_state(copy.deepcopy(DEFAULT_CATEGORIES), write_state=True)
+@traced
+def refresh_state_from_disk(*, rewrite: bool = False) -> None:
+    # Holds the writer's lock so these state.md and snapshot writes never
+    # overlap a flush writing the same files.
+    with STATE_WRITER.exclusive():
+        _reimport_state_from_disk(rewrite)
 
 
-def refresh_state_from_disk() -> None:
-    global _state_categories, _code_index
+def _reimport_state_from_disk(rewrite: bool) -> None:
+    global _state
     if STATE_MD.exists():
-        parsed = parse_checklist(STATE_MD.read_text(encoding="utf-8"))
+        signature = _file_signature(STATE_MD)
+        text = STATE_MD.read_text(encoding="utf-8")
+        _remember_state_markdown(text, signature)
+        parsed = parse_checklist(text)
         apply_pack_sizes(parsed)
     else:
         parsed = []
+    template = get_default_pack_state()
     if not parsed:
-        parsed = copy.deepcopy(DEFAULT_CATEGORIES)
-        persist_state(parsed, write_state=True)
+        with STATE_LOCK:
+            loaded = template.copy()
+        write_state_markdown(loaded.markdown())
     else:
         merged = merge_categories_with_defaults(parsed)
-        if merged != parsed:
+        if rewrite or merged != parsed:
             parsed = merged
             persist_state(parsed, write_state=True)
-    _state_categories = parsed
-    rebuild_code_index()
-
-
-def _build_payload_locked(markdown: str | None = None) -> Dict:
-    snapshot = copy.deepcopy(_state_categories)
-    markdown_text = markdown or generate_markdown(snapshot)
-    payload = {
-        "categories": snapshot,
-        "disableArgument": build_disable_argument(snapshot),
-        "markdown": markdown_text,
-        "storage": summarize_storage(snapshot),
-        "updatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
-    }
+        loaded = PackState.from_categories(parsed, template)
+    with STATE_LOCK:
+        _state = loaded
+        _record_change_locked(None)
+        _clear_history_locked()
+        snapshot = loaded.copy()
+        journal_seq = _journal_seq
+    _compact_journal(snapshot, journal_seq)
+
+
+@traced
+def load_state_snapshot() -> bool:
+    # Snapshot plus journal tail. state.md wins when it was edited after the
+    # export the snapshot saw; the caller then re-imports it with
+    # refresh_state_from_disk, which also discards the journal.
+    global _state, _state_md_lines, _state_md_signature, _state_md_exported, _journal_seq
+    snapshot = read_state_snapshot()
+    if snapshot is None:
+        return False
+    loaded, exported, journal_seq = snapshot
+    signature = _file_signature(STATE_MD)
+    if signature is not None and signature != exported:
+        if exported is None or signature[0] > exported[0]:
+            return False
+    records, intact = read_journal(journal_seq)
+    template = get_default_pack_state()
+    stale = signature is None or signature != exported or not intact
+    baseline = loaded.copy() if signature is not None and signature == exported else None
+    with STATE_LOCK:
+        _state = loaded
+        for _seq, _line, record in records:
+            _replay_journal_record_locked(record)
+        if _state.catalogue is not template.catalogue:
+            categories = _state.to_categories()
+            merged = merge_categories_with_defaults(categories)
+            if merged != categories:
+                _state = PackState.from_categories(merged, template)
+                stale = True
+        for code, size_gb in PACK_SIZE_GB.items():
+            _state.set_size(code, size_gb)
+        with JOURNAL_LOCK:
+            _journal_tail[:] = [(seq, line) for seq, line, _record in records]
+        _journal_seq = records[-1][0] if records else journal_seq
+        _record_change_locked(None)
+    with STATE_MD_LOCK:
+        _state_md_lines = None
+        _state_md_signature = signature
+        _state_md_exported = baseline
+    if records:
+        # The launcher and state.md may not have caught up before the
+        # journal tail was written; bootstrap flushes before reading back.
+        schedule_persist()
+    elif stale:
+        schedule_persist(sync_launcher=False)
+    return True
+
+
+def _checklist_body(lines: List[str]) -> List[str]:
+    # The Output section is derived from the checkboxes, so edits to it are
+    # ignored.
+    for index, line in enumerate(lines):
+        if line.strip().startswith("## Output"):
+            return lines[:index]
+    return lines
+
+
+def _changed_line_pairs(old: List[str], new: List[str]) -> List[Tuple[str, str]] | None:
+    # Line-level diff of two checklists: the (old, new) pairs of lines that
+    # were edited in place, or None when lines that carry content were added
+    # or removed. Blank and unparsed lines may come and go.
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and old[start] == new[start]:
+        start += 1
+    old_end, new_end = len(old), len(new)
+    while old_end > start and new_end > start and old[old_end - 1] == new[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    old, new = old[start:old_end], new[start:new_end]
+    pairs: List[Tuple[str, str]] = []
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        if tag == "replace" and i2 - i1 == j2 - j1:
+            pairs.extend(zip(old[i1:i2], new[j1:j2]))
+            continue
+        removed = [line for line in old[i1:i2] if _parse_checklist_line(line) is not None]
+        added = [line for line in new[j1:j2] if _parse_checklist_line(line) is not None]
+        if len(removed) != len(added):
+            return None
+        pairs.extend(zip(removed, added))
+    return pairs
+
+
+def _apply_checklist_edit_locked(old: List[str], new: List[str]) -> List[str] | None:
+    # Returns the codes changed by an edit that only touched checkbox lines of
+    # packs already in the catalogue, or None when the edit needs a full
+    # re-parse (headings, reordering, new or renamed packs).
+    pairs = _changed_line_pairs(_checklist_body(old), _checklist_body(new))
+    if pairs is None:
+        return None
+    catalogue = _state.catalogue
+    updates: List[Tuple[str, bool, float]] = []
+    for before_line, after_line in pairs:
+        before = _parse_checklist_line(before_line)
+        after = _parse_checklist_line(after_line)
+        if before is None and after is None:
+            continue
+        if before is None or after is None or before[0] != "item" or after[0] != "item":
+            return None
+        if before[1] != after[1]:
+            return None
+        _kind, code, name, enabled, parsed_size = after
+        slot = catalogue.slots.get(code)
+        if slot is None or catalogue.records[slot].name != name:
+            return None
+        updates.append((code, enabled, get_pack_size_gb(code, parsed_size)))
+    changed: List[str] = []
+    flipped: List[str] = []
+    for code, enabled, size_gb in updates:
+        toggled = _state.set_enabled(code, enabled)
+        resized = _state.set_size(code, size_gb)
+        if toggled:
+            flipped.append(code)
+        if toggled or resized:
+            changed.append(code)
+    _journal_change_locked("edit", flipped)
+    return changed
+
+
+@traced
+def reload_state_from_disk() -> bool:
+    global _state_md_lines, _state_md_signature, _state_md_exported
+    signature = _file_signature(STATE_MD)
+    with STATE_MD_LOCK:
+        if signature is None or signature == _state_md_signature:
+            return False
+        known = _state_md_lines
+        exported = _state_md_exported
+    previous = known
+    if previous is None and exported is not None:
+        previous = exported.markdown().splitlines()
+    try:
+        text = STATE_MD.read_text(encoding="utf-8")
+    except OSError:
+        return False
+    lines = text.splitlines()
+    with STATE_LOCK:
+        changed = None
+        if previous is not None and _state is not None:
+            changed = _apply_checklist_edit_locked(previous, lines)
+        if changed:
+            _record_change_locked(changed)
+    if changed is None:
+        refresh_state_from_disk()
+        # The edit has to reach the launcher too, or the next start-up's
+        # launcher sync would undo it.
+        schedule_persist()
+        return True
+    with STATE_MD_LOCK:
+        if _state_md_lines is known and _state_md_exported is exported:
+            _state_md_lines = lines
+            _state_md_signature = signature
+            _state_md_exported = None
+    if changed:
+        schedule_persist()
+    return bool(changed)
+
+
+def _record_change_locked(codes: Iterable[str] | None) -> int:
+    global _state_version, _aggregates_cache, _payload_cache
+    _state_version += 1
+    _change_log.append((_state_version, None if codes is None else frozenset(codes)))
+    _aggregates_cache = None
+    _payload_cache = None
+    STATE_CHANGED.notify_all()
+    return _state_version
+
+
+def get_state_version() -> int:
+    with STATE_LOCK:
+        return _state_version
+
+
+def set_journal_fsync_policy(policy: str) -> None:
+    global JOURNAL_FSYNC
+    if policy not in JOURNAL_FSYNC_POLICIES:
+        raise ValueError(f"Unknown journal fsync policy: {policy}")
+    JOURNAL_FSYNC = policy
+
+
+def _append_journal_locked(record: Dict) -> None:
+    # Called with STATE_LOCK held, so records land in the order they were
+    # applied. A failed append is covered by the next compaction. The fsync
+    # is left to schedule_persist, which runs once the lock is released.
+    global _journal_handle, _journal_seq, _journal_unsynced
+    _journal_seq += 1
+    line = (json.dumps({"seq": _journal_seq, **record}, separators=(",", ":")) + "\n").encode("utf-8")
+    with JOURNAL_LOCK:
+        _journal_tail.append((_journal_seq, line))
+        try:
+            if _journal_handle is None:
+                _journal_handle = open(JOURNAL_FILE, "ab")
+            _journal_handle.write(line)
+            _journal_handle.flush()
+            _journal_unsynced = True
+        except OSError:
+            pass
+
+
+def sync_journal() -> None:
+    # Syncs a duplicate descriptor so appends, which hold JOURNAL_LOCK under
+    # STATE_LOCK, never wait for the disk. JOURNAL_SYNC_LOCK makes a caller
+    # that finds nothing unsynced wait for an fsync still in flight.
+    global _journal_unsynced, _journal_synced_at
+    with JOURNAL_SYNC_LOCK:
+        with JOURNAL_LOCK:
+            if not _journal_unsynced or _journal_handle is None or JOURNAL_FSYNC == "never":
+                return
+            descriptor = os.dup(_journal_handle.fileno())
+            _journal_unsynced = False
+            _journal_synced_at = time.monotonic()
+        try:
+            os.fsync(descriptor)
+        except OSError:
+            with JOURNAL_LOCK:
+                _journal_unsynced = True
+            raise
+        finally:
+            os.close(descriptor)
+
+
+def _sync_journal_for_policy() -> None:
+    if JOURNAL_FSYNC == "always" or (
+        JOURNAL_FSYNC == "interval"
+        and time.monotonic() - _journal_synced_at >= JOURNAL_FSYNC_INTERVAL_SECONDS
+    ):
+        try:
+            sync_journal()
+        except OSError:
+            return
+
+
+def _truncate_journal_locked(journal_seq: int) -> None:
+    # Drops the records a snapshot taken at journal_seq already contains.
+    global _journal_handle, _journal_unsynced
+    with JOURNAL_LOCK:
+        _journal_tail[:] = [entry for entry in _journal_tail if entry[0] > journal_seq]
+        if _journal_handle is not None:
+            _journal_handle.close()
+            _journal_handle = None
+        _journal_unsynced = False
+        if _journal_tail:
+            atomic_write_bytes(JOURNAL_FILE, b"".join(line for _seq, line in _journal_tail))
+        else:
+            JOURNAL_FILE.unlink(missing_ok=True)
+
+
+def read_journal(after: int) -> Tuple[List[Tuple[int, bytes, Dict]], bool]:
+    # Records newer than the snapshot, and whether every line was intact; a
+    # torn final line from a crash ends the replay.
+    try:
+        data = JOURNAL_FILE.read_bytes()
+    except OSError:
+        return [], True
+    entries: List[Tuple[int, bytes, Dict]] = []
+    previous = 0
+    for line in data.splitlines(keepends=True):
+        try:
+            record = json.loads(line) if line.endswith(b"\n") else None
+        except ValueError:
+            record = None
+        seq = record.get("seq") if isinstance(record, dict) else None
+        if not isinstance(seq, int) or seq <= previous:
+            return entries, False
+        previous = seq
+        if seq > after:
+            entries.append((seq, line, record))
+    return entries, True
+
+
+def _journal_change_locked(op: str, flipped: Iterable[str], added: Iterable[str] = ()) -> None:
+    enabled = _state.enabled
+    slots = _state.catalogue.slots
+    enable: List[str] = []
+    disable: List[str] = []
+    for code in flipped:
+        (enable if enabled[slots[code]] else disable).append(code)
+    added = list(added)
+    if not enable and not disable and not added:
+        return
+    record: Dict = {"op": op, "enable": enable, "disable": disable}
+    if added:
+        record["add"] = added
+    _append_journal_locked(record)
+    if enable or disable:
+        _undo_history.append({"op": op, "enable": enable, "disable": disable})
+        _redo_history.clear()
+
+
+def _clear_history_locked() -> None:
+    _undo_history.clear()
+    _redo_history.clear()
+
+
+def _replay_journal_record_locked(record: Dict) -> None:
+    global _state
+    op = record.get("op")
+    if op == "reset-catalogue":
+        _state = get_default_pack_state().copy()
+        _clear_history_locked()
+        return
+    added = record.get("add")
+    if added:
+        add_missing_codes(added, enabled=False)
+    slots = _state.catalogue.slots
+    enable = [code for code in record.get("enable", ()) if code in slots]
+    disable = [code for code in record.get("disable", ()) if code in slots]
+    for code in enable:
+        _state.set_enabled(code, True)
+    for code in disable:
+        _state.set_enabled(code, False)
+    if op == "undo":
+        if _undo_history:
+            _redo_history.append(_undo_history.pop())
+    elif op == "redo":
+        if _redo_history:
+            _undo_history.append(_redo_history.pop())
+    elif enable or disable:
+        _undo_history.append({"op": op, "enable": enable, "disable": disable})
+        _redo_history.clear()
+
+
+def _step_history_locked(
+    source: "Deque[Dict] | List[Dict]", target: "Deque[Dict] | List[Dict]", op: str
+) -> bool:
+    if not source:
+        return False
+    change = source.pop()
+    if op == "undo":
+        enable, disable = change["disable"], change["enable"]
+    else:
+        enable, disable = change["enable"], change["disable"]
+    slots = _state.catalogue.slots
+    flipped = [
+        code for code in enable if code in slots and _state.set_enabled(code, True)
+    ] + [code for code in disable if code in slots and _state.set_enabled(code, False)]
+    _append_journal_locked({"op": op, "enable": enable, "disable": disable})
+    target.append(change)
+    if flipped:
+        _record_change_locked(flipped)
+    return True
+
+
+def history_depth() -> Tuple[int, int]:
+    with STATE_LOCK:
+        return len(_undo_history), len(_redo_history)
+
+
+@traced
+def undo_last_change(*, since: int | None = None) -> Dict:
+    ensure_bootstrapped()
+    with STATE_LOCK:
+        stepped = _step_history_locked(_undo_history, _redo_history, "undo")
+        payload = _build_payload_locked(since)
+    if stepped:
+        schedule_persist()
     return payload
 
 
-def build_payload() -> Dict:
-    sync_state_from_launcher()
+@traced
+def redo_last_change(*, since: int | None = None) -> Dict:
+    ensure_bootstrapped()
     with STATE_LOCK:
-        return _build_payload_locked()
+        stepped = _step_history_locked(_redo_history, _undo_history, "redo")
+        payload = _build_payload_locked(since)
+    if stepped:
+        schedule_persist()
+    return payload
 
 
+def _changed_codes_since_locked(since: int) -> set[str] | None:
+    if since == _state_version:
+        return set()
+    if since > _state_version or not _change_log or since < _change_log[0][0] - 1:
+        return None
+    changed: set[str] = set()
+    for version, codes in reversed(_change_log):
+        if version <= since:
+            break
+        if codes is None:
+            return None
+        changed.update(codes)
+    return changed
+
+
+def _build_aggregates_locked() -> Dict:
+    global _aggregates_cache
+    if _aggregates_cache is None:
+        _aggregates_cache = {
+            "version": _state_version,
+            "disableArgument": _state.disable_argument(),
+            "storage": _state.storage(),
+            "updatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+    return _aggregates_cache
+
+
+def _build_markdown_locked() -> str:
+    # O(catalogue), so deltas leave it out; full payloads and
+    # current_markdown share one render per state version.
+    global _markdown_cache
+    if _markdown_cache is None or _markdown_cache[0] != _state_version:
+        _markdown_cache = (_state_version, _state.markdown())
+    return _markdown_cache[1]
+
+
+def _build_payload_locked(since: int | None = None) -> Dict:
+    # Payloads are cached per state version and shared between callers, so
+    # they must be treated as read-only.
+    global _payload_cache
+    if since is not None:
+        changed = _changed_codes_since_locked(since)
+        if changed is not None:
+            return {
+                **_build_aggregates_locked(),
+                "full": False,
+                "since": since,
+                "items": [
+                    _state.item(_state.catalogue.slots[code]) for code in sorted(changed)
+                ],
+            }
+    if _payload_cache is None:
+        _payload_cache = {
+            **_build_aggregates_locked(),
+            "markdown": _build_markdown_locked(),
+            "full": True,
+            "categories": _state.to_categories(),
+        }
+    return _payload_cache
+
+
+@traced
+def build_payload(since: int | None = None) -> Dict:
+    ensure_bootstrapped()
+    if not _launcher_watch_active:
+        reload_state_from_disk()
+        sync_state_from_launcher()
+    with STATE_LOCK:
+        return _build_payload_locked(since)
+
+
+def wait_for_payload(since: int | None, timeout: float) -> Dict | None:
+    # Blocks until the state moves past since; None when the timeout passes
+    # without a change.
+    with STATE_LOCK:
+        if since is not None:
+            STATE_CHANGED.wait_for(lambda: _state_version != since, timeout=timeout)
+        if since == _state_version:
+            return None
+        return _build_payload_locked(since)
+
+
+@traced
 def apply_disable_argument(
-    argument: str, *, write_state: bool = True, sync_launcher_file: bool = True
+    argument: str,
+    *,
+    write_state: bool = True,
+    sync_launcher_file: bool = True,
+    since: int | None = None,
 ) -> Dict:
-    _canonical, codes = parse_disable_argument(argument)
-    disabled_codes = set(codes)
+    _canonical, codes = _parse_disable_argument(argument)
+    ensure_bootstrapped()
     with STATE_LOCK:
-        add_missing_codes(disabled_codes, enabled=False)
-        apply_disabled_codes(disabled_codes)
-        markdown, disable_arg = persist_state(_state_categories, write_state=write_state)
-        payload = _build_payload_locked(markdown)
-    if sync_launcher_file:
-        sync_launcher_argument(disable_arg)
+        added = add_missing_codes(codes, enabled=False)
+        flipped = apply_disabled_codes(codes)
+        if added:
+            _record_change_locked(None)
+        elif flipped:
+            _record_change_locked(flipped)
+        _journal_change_locked("disable-argument", flipped, added)
+        payload = _build_payload_locked(since)
+    schedule_persist(write_state=write_state, sync_launcher=sync_launcher_file)
     return payload
 
 
-def update_item_state(code: str, enabled: bool) -> Dict:
+@traced
+def update_item_state(code: str, enabled: bool, *, since: int | None = None) -> Dict:
     normalized = code.strip().upper()
+    ensure_bootstrapped()
     with STATE_LOCK:
-        if normalized not in _code_index:
+        if normalized not in _state.catalogue.slots:
             raise KeyError(normalized)
-        stored = _code_index[normalized]
-        stored["enabled"] = enabled
-        markdown, disable_arg = persist_state(_state_categories, write_state=True)
-        payload = _build_payload_locked(markdown)
-    sync_launcher_argument(disable_arg)
+        if _state.set_enabled(normalized, enabled):
+            _record_change_locked([normalized])
+            _journal_change_locked("toggle", [normalized])
+        payload = _build_payload_locked(since)
+    schedule_persist()
+    return payload
+
+
+@traced
+def update_items_state(changes: Mapping[str, bool], *, since: int | None = None) -> Dict:
+    normalized = {code.strip().upper(): bool(enabled) for code, enabled in changes.items()}
+    ensure_bootstrapped()
+    with STATE_LOCK:
+        slots = _state.catalogue.slots
+        for code in normalized:
+            if code not in slots:
+                raise KeyError(code)
+        flipped = [
+            code for code, enabled in normalized.items() if _state.set_enabled(code, enabled)
+        ]
+        if flipped:
+            _record_change_locked(flipped)
+            _journal_change_locked("batch", flipped)
+        payload = _build_payload_locked(since)
+    if flipped:
+        schedule_persist()
     return payload
 
 
-def reset_state_to_default() -> Dict:
-    global _state_categories, _code_index
+@traced
+def reset_state_to_default(*, since: int | None = None) -> Dict:
+    global _state
+    ensure_bootstrapped()
+    template = get_default_pack_state()
     with STATE_LOCK:
-        _state_categories = copy.deepcopy(DEFAULT_CATEGORIES)
-        _code_index = build_code_index(_state_categories)
-        markdown, disable_arg = persist_state(_state_categories, write_state=True)
-        payload = _build_payload_locked(markdown)
-    sync_launcher_argument(disable_arg)
+        if _state.catalogue is template.catalogue:
+            flipped = _state.apply_disabled_mask(template.disabled_mask)
+            if flipped:
+                _record_change_locked(flipped)
+                _journal_change_locked("reset", flipped)
+        else:
+            # Dropping packs outside the defaults cannot be undone by flips.
+            _state = template.copy()
+            _record_change_locked(None)
+            _append_journal_locked({"op": "reset-catalogue"})
+            _clear_history_locked()
+        payload = _build_payload_locked(since)
+    schedule_persist()
+    return payload
+
+
+def update_pack_size(code: str, size_gb: float) -> bool:
+    template = get_default_pack_state()
+    with STATE_LOCK:
+        PACK_SIZE_GB[code] = size_gb
+        template.set_size(code, size_gb)
+        if _state is None or not _state.set_size(code, size_gb):
+            return False
+        _record_change_locked([code])
+        return True
+
+
+def current_storage() -> Dict[str, float]:
+    ensure_bootstrapped()
+    with STATE_LOCK:
+        return _state.storage()
+
+
+def current_disable_argument() -> str:
+    ensure_bootstrapped()
+    with STATE_LOCK:
+        return _state.disable_argument()
+
+
+def current_markdown() -> Dict:
+    ensure_bootstrapped()
+    with STATE_LOCK:
+        return {"version": _state_version, "markdown": _build_markdown_locked()}
+
+
+@traced
+def refresh_pack_sizes(
+    on_size: Callable[[str, float, int, int], None] | None = None,
+) -> bool:
+    ensure_bootstrapped()
+    changed = False
+
+    def record(code: str, size_gb: float, completed: int, total: int) -> None:
+        nonlocal changed
+        changed = update_pack_size(code, size_gb) or changed
+        if on_size is not None:
+            on_size(code, size_gb, completed, total)
+
+    with STATE_LOCK:
+        codes = set(_state.catalogue.slots) | set(get_default_code_to_category())
+    load_pack_sizes(codes, on_size=record)
+    if not changed:
+        return False
+    with STATE_LOCK:
+        apply_pack_sizes(get_default_categories())
+        _refresh_profile_storage_locked()
+    schedule_persist(sync_launcher=False)
+    DEFAULT_MD.write_text(generate_markdown(get_default_categories()), encoding="utf-8")
+    return True
+
+
+def start_pack_size_refresh(
+    on_size: Callable[[str, float, int, int], None] | None = None,
+    on_finished: Callable[[bool], None] | None = None,
+) -> Thread:
+    def run() -> None:
+        changed = refresh_pack_sizes(on_size)
+        if on_finished is not None:
+            on_finished(changed)
+
+    # The scan's pool is imported lazily; load it on the caller's thread, since
+    # concurrent.futures cannot register its exit hook from a daemon thread
+    # once the interpreter has started shutting down.
+    importlib.import_module("concurrent.futures.thread")
+
+    thread = Thread(target=run, name="pack-size-scan", daemon=True)
+    thread.start()
+    return thread
+
+
+class PackProfile:
+    """A named set of disabled packs, stored as a mask over the catalogue it was saved against."""
+
+    __slots__ = ("name", "codes", "mask", "storage")
+
+    def __init__(
+        self, name: str, codes: Tuple[str, ...], mask: int, storage: Dict[str, float]
+    ) -> None:
+        self.name = name
+        self.codes = codes
+        self.mask = mask
+        self.storage = storage
+
+    def disabled_codes(self) -> Tuple[str, ...]:
+        return tuple(self.codes[slot] for slot in _iter_set_bits(self.mask))
+
+
+_profiles: Dict[str, PackProfile] | None = None
+
+
+def _read_profiles() -> Dict[str, PackProfile]:
+    try:
+        data = json.loads(PROFILES_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != PROFILES_VERSION:
+        return {}
+    raw_catalogues = data.get("catalogues", [])
+    entries = data.get("profiles", {})
+    if not (
+        isinstance(raw_catalogues, list)
+        and all(
+            isinstance(codes, list) and all(isinstance(code, str) for code in codes)
+            for codes in raw_catalogues
+        )
+        and isinstance(entries, dict)
+    ):
+        return {}
+    catalogues = [tuple(codes) for codes in raw_catalogues]
+    profiles: Dict[str, PackProfile] = {}
+    for name, entry in entries.items():
+        try:
+            index = entry["catalogue"]
+            if not isinstance(index, int) or isinstance(index, bool) or index < 0:
+                continue
+            codes = catalogues[index]
+            mask = int(entry["mask"], 16)
+            storage = {key: float(entry["storage"][key]) for key in ("enabledGB", "disabledGB", "totalGB")}
+        except (IndexError, KeyError, TypeError, ValueError):
+            continue
+        if mask >> len(codes):
+            continue
+        profiles[name] = PackProfile(name, codes, mask, storage)
+    return profiles
+
+
+def _write_profiles_locked() -> None:
+    catalogues: List[Tuple[str, ...]] = []
+    entries: Dict[str, Dict] = {}
+    for name, profile in sorted(_profiles.items()):
+        if profile.codes not in catalogues:
+            catalogues.append(profile.codes)
+        entries[name] = {
+            "catalogue": catalogues.index(profile.codes),
+            "mask": format(profile.mask, "x"),
+            "storage": profile.storage,
+        }
+    data = {
+        "version": PROFILES_VERSION,
+        "catalogues": [list(codes) for codes in catalogues],
+        "profiles": entries,
+    }
+    atomic_write_text(PROFILES_FILE, json.dumps(data, indent=2))
+
+
+def _get_profiles_locked() -> Dict[str, PackProfile]:
+    global _profiles
+    if _profiles is None:
+        _profiles = _read_profiles()
+        if _state is not None:
+            # Share the live code tuple so switching skips the remap.
+            for profile in _profiles.values():
+                if profile.codes == _state.catalogue.codes:
+                    profile.codes = _state.catalogue.codes
+    return _profiles
+
+
+def _profile_storage_locked(profile: PackProfile) -> Dict[str, float]:
+    if profile.codes == _state.catalogue.codes:
+        return _state.storage_for_mask(profile.mask)
+    disabled = set(profile.disabled_codes())
+    enabled_gb = 0.0
+    disabled_gb = 0.0
+    for code in profile.codes:
+        if code in disabled:
+            disabled_gb += get_pack_size_gb(code)
+        else:
+            enabled_gb += get_pack_size_gb(code)
+    return _storage_summary(enabled_gb, disabled_gb)
+
+
+def _refresh_profile_storage_locked() -> None:
+    profiles = _get_profiles_locked()
+    if not profiles:
+        return
+    changed = False
+    for profile in profiles.values():
+        storage = _profile_storage_locked(profile)
+        if storage != profile.storage:
+            profile.storage = storage
+            changed = True
+    if changed:
+        try:
+            _write_profiles_locked()
+        except OSError:
+            pass
+
+
+def list_profiles() -> List[Dict]:
+    with STATE_LOCK:
+        profiles = _get_profiles_locked()
+        return [
+            {"name": name, "storage": dict(profiles[name].storage)}
+            for name in sorted(profiles, key=str.casefold)
+        ]
+
+
+@traced
+def save_profile(name: str) -> Dict:
+    name = name.strip()
+    if not name:
+        raise ValueError("Profile name cannot be empty.")
+    ensure_bootstrapped()
+    with STATE_LOCK:
+        profiles = _get_profiles_locked()
+        profile = PackProfile(
+            name, _state.catalogue.codes, _state.disabled_mask, _state.storage()
+        )
+        profiles[name] = profile
+        _write_profiles_locked()
+        return {"name": name, "storage": dict(profile.storage)}
+
+
+def delete_profile(name: str) -> bool:
+    with STATE_LOCK:
+        profiles = _get_profiles_locked()
+        if profiles.pop(name, None) is None:
+            return False
+        _write_profiles_locked()
+        return True
+
+
+@traced
+def switch_profile(name: str, *, since: int | None = None) -> Dict:
+    ensure_bootstrapped()
+    with STATE_LOCK:
+        profile = _get_profiles_locked().get(name)
+        if profile is None:
+            raise KeyError(name)
+        if profile.codes is _state.catalogue.codes:
+            added: Tuple[str, ...] = ()
+            mask = profile.mask
+        else:
+            codes = profile.disabled_codes()
+            added = add_missing_codes(codes, enabled=False)
+            mask, _unknown = _state.catalogue.mask_for_codes(codes)
+            if profile.codes == _state.catalogue.codes:
+                profile.codes = _state.catalogue.codes
+        flipped = _state.apply_disabled_mask(mask)
+        if added:
+            _record_change_locked(None)
+        elif flipped:
+            _record_change_locked(flipped)
+        _journal_change_locked("profile", flipped, added)
+        payload = _build_payload_locked(since)
+    schedule_persist()
     return payload
 
 
 def bootstrap_state() -> None:
-    ensure_output_files()
-    refresh_state_from_disk()
+    # Stages run in this order: defaults (raw.txt plus cached pack sizes),
+    # default.md, snapshot and journal replay (or state.md load/merge/rewrite),
+    # pending writes, launcher sync.
+    DEFAULT_MD.write_text(generate_markdown(get_default_categories()), encoding="utf-8")
+    if not load_state_snapshot():
+        refresh_state_from_disk(rewrite=True)
+    flush_pending_writes()
     sync_state_from_launcher(force=True)
 
 
-bootstrap_state()
-
-class ChecklistWindow(QtWidgets.QMainWindow):
-    """Simple desktop UI for browsing and updating the Sims 4 DLC checklist."""
-
-    def __init__(self) -> None:
-        super().__init__()
-        self.setWindowTitle("Sims 4 DLC Checklist")
-        self.resize(1100, 750)
-        self.checkbox_map: Dict[str, QtWidgets.QCheckBox] = {}
-        self._rendered_codes: set[str] = set()
-        self._build_ui()
-        self.refresh_payload()
-
-    def _build_ui(self) -> None:
-        central = QtWidgets.QWidget()
-        self.setCentralWidget(central)
-        main_layout = QtWidgets.QVBoxLayout(central)
-        main_layout.setSpacing(12)
-
-        self.updated_label = QtWidgets.QLabel("Last updated: --")
-        self.updated_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
-        main_layout.addWidget(self.updated_label)
-        self.storage_label = QtWidgets.QLabel("Enabled: 0.00 GB | Disabled: 0.00 GB | Total: 0.00 GB")
-        self.storage_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
-        main_layout.addWidget(self.storage_label)
-
-        self.scroll_area = QtWidgets.QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.categories_container = QtWidgets.QWidget()
-        self.categories_layout = QtWidgets.QVBoxLayout(self.categories_container)
-        self.categories_layout.setContentsMargins(0, 0, 0, 0)
-        self.categories_layout.setSpacing(10)
-        self.scroll_area.setWidget(self.categories_container)
-        main_layout.addWidget(self.scroll_area, stretch=1)
-
-        disable_row = QtWidgets.QHBoxLayout()
-        disable_label = QtWidgets.QLabel("Disable argument:")
-        self.disable_line = QtWidgets.QLineEdit()
-        self.disable_line.setPlaceholderText("-disablepacks:EP01,EP02,...")
-        self.apply_argument_button = QtWidgets.QPushButton("Apply")
-        self.apply_argument_button.clicked.connect(self.apply_disable_argument_from_ui)
-        disable_row.addWidget(disable_label)
-        disable_row.addWidget(self.disable_line, stretch=1)
-        disable_row.addWidget(self.apply_argument_button)
-        main_layout.addLayout(disable_row)
-
-        button_row = QtWidgets.QHBoxLayout()
-        self.refresh_button = QtWidgets.QPushButton("Refresh from Launcher")
-        self.refresh_button.clicked.connect(self.refresh_from_launcher)
-        self.reset_button = QtWidgets.QPushButton("Reset to Default")
-        self.reset_button.clicked.connect(self.reset_state_to_default)
-        button_row.addWidget(self.refresh_button)
-        button_row.addWidget(self.reset_button)
-        button_row.addStretch()
-        main_layout.addLayout(button_row)
-
-        self.markdown_edit = QtWidgets.QPlainTextEdit()
-        self.markdown_edit.setReadOnly(True)
-        self.markdown_edit.setPlaceholderText("Markdown view of the current checklist.")
-        self.markdown_edit.setMinimumHeight(180)
-        main_layout.addWidget(self.markdown_edit)
-
-        self.setStatusBar(QtWidgets.QStatusBar())
-
-    def _ensure_category_widgets(self, categories: List[Dict]) -> None:
-        next_codes = {item["code"] for item in flatten_items(categories)}
-        if next_codes == self._rendered_codes:
-            return
-        self.checkbox_map = {}
-        while self.categories_layout.count():
-            item = self.categories_layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
-        for category in categories:
-            group_box = QtWidgets.QGroupBox(category["title"])
-            group_layout = QtWidgets.QGridLayout(group_box)
-            group_layout.setHorizontalSpacing(12)
-            group_layout.setVerticalSpacing(8)
-            for col in range(3):
-                group_layout.setColumnStretch(col, 1)
-            for idx, item in enumerate(category["items"]):
-                size_gb = float(item.get("size_gb", 0.0))
-                label = f"{item['name']} ({item['code']}) - {size_gb:.2f} GB"
-                checkbox = QtWidgets.QCheckBox(label)
-                icon = get_pack_icon(item["code"])
-                if icon:
-                    checkbox.setIcon(icon)
-                    checkbox.setIconSize(QtCore.QSize(SVG_ICON_SIZE, SVG_ICON_SIZE))
-                checkbox.setChecked(item.get("enabled", False))
-                checkbox.stateChanged.connect(
-                    partial(self.handle_checkbox_state_changed, item["code"])
-                )
-                row, col = divmod(idx, 3)
-                group_layout.addWidget(checkbox, row, col)
-                self.checkbox_map[item["code"]] = checkbox
-            self.categories_layout.addWidget(group_box)
-        self.categories_layout.addStretch()
-        self._rendered_codes = next_codes
-
-    def _update_checkboxes(self, categories: List[Dict]) -> None:
-        for category in categories:
-            for item in category["items"]:
-                checkbox = self.checkbox_map.get(item["code"])
-                if checkbox is None:
-                    continue
-                block = checkbox.blockSignals(True)
-                checkbox.setChecked(item.get("enabled", False))
-                checkbox.blockSignals(block)
-
-    def _apply_payload(self, payload: Dict) -> None:
-        self._ensure_category_widgets(payload["categories"])
-        self._update_checkboxes(payload["categories"])
-        self.disable_line.setText(payload["disableArgument"])
-        self.markdown_edit.setPlainText(payload["markdown"])
-        self.updated_label.setText(f"Last updated: {payload['updatedAt']}")
-        storage = payload.get("storage", {"enabledGB": 0.0, "disabledGB": 0.0, "totalGB": 0.0})
-        self.storage_label.setText(
-            f"Enabled: {storage['enabledGB']:.2f} GB | Disabled: {storage['disabledGB']:.2f} GB | Total: {storage['totalGB']:.2f} GB"
-        )
+ensure_bootstrapped = run_once(bootstrap_state)
+
+_LAZY_ATTRIBUTES: Dict[str, Callable[[], object]] = {
+    "RAW_CHECKLIST": get_raw_checklist,
+    "SVG_SYMBOLS": get_svg_symbols,
+    "LAUNCHER_BAT": get_launcher_path,
+    "GAME_INSTALL_DIR": get_game_install_dir,
+    "DEFAULT_CATEGORIES": get_default_categories,
+    "DEFAULT_CODE_TO_CATEGORY": get_default_code_to_category,
+}
 
-    def refresh_payload(self) -> None:
-        payload = build_payload()
-        self._apply_payload(payload)
 
-    def handle_checkbox_state_changed(self, code: str, state: int) -> None:
-        enabled = QtCore.Qt.CheckState(state) == QtCore.Qt.CheckState.Checked
+def __getattr__(name: str) -> object:
+    loader = _LAZY_ATTRIBUTES.get(name)
+    if loader is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return loader()
+
+
+class ChecklistTarget:
+    """A launcher, state file and install directory synced headlessly with their own state."""
+
+    __slots__ = ("name", "launcher", "state_md", "install_dir", "state", "_markdown")
+
+    def __init__(
+        self, name: str, launcher: Path, state_md: Path, install_dir: Path | None = None
+    ) -> None:
+        self.name = name
+        self.launcher = launcher
+        self.state_md = state_md
+        self.install_dir = install_dir
+        self.state: PackState | None = None
+        self._markdown = ""
+
+    def load_state(self) -> None:
+        # The same load/merge as bootstrap_state, over the shared defaults.
+        template = get_default_pack_state()
         try:
-            payload = update_item_state(code, enabled)
-        except KeyError:
-            QtWidgets.QMessageBox.warning(
-                self,
-                "Unknown DLC Code",
-                f"DLC code '{code}' could not be found.",
+            self._markdown = self.state_md.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            self._markdown = ""
+        parsed = parse_checklist(self._markdown)
+        if parsed:
+            self.state = PackState.from_categories(merge_categories_with_defaults(parsed), template)
+        else:
+            self.state = template.copy()
+
+    def measure_sizes(self) -> None:
+        # Sizes come from this target's install directory, or else from its
+        # own state.md; never from the host's measurements, which the shared
+        # defaults were built with.
+        if self.install_dir is None:
+            sizes: Dict[str, float] = {}
+            for entry in map(_parse_checklist_line, self._markdown.splitlines()):
+                if entry is None or entry[0] == "title":
+                    continue
+                if entry[0] == "end":
+                    break
+                if entry[4] is not None:
+                    sizes[entry[1]] = round(entry[4], 2)
+        else:
+            sizes = measure_pack_sizes(
+                self.install_dir,
+                set(self.state.catalogue.codes),
+                self.state_md.with_name(f"{self.state_md.stem}.{PACK_SIZE_CACHE.name}"),
             )
-            self.refresh_payload()
-            return
-        self._apply_payload(payload)
-        action = "enabled" if enabled else "disabled"
-        self.statusBar().showMessage(f"{code} {action}", 3000)
+        for code in self.state.catalogue.codes:
+            self.state.set_size(code, sizes.get(code, 0.0))
 
-    def apply_disable_argument_from_ui(self) -> None:
-        argument = self.disable_line.text().strip()
+    def sync_from_launcher(self) -> int:
+        argument = extract_disable_argument(
+            self.launcher.read_text(encoding="utf-8", errors="ignore")
+        )
         if not argument:
-            QtWidgets.QMessageBox.warning(
-                self, "Missing Argument", "Enter a -disablepacks argument first."
+            return 0
+        _canonical, codes = _parse_disable_argument(argument)
+        _mask, unknown = self.state.catalogue.mask_for_codes(codes)
+        if unknown:
+            self.state = self.state.with_added_codes(set(unknown), enabled=False)
+        return len(unknown) + len(self.state.apply_disabled(codes))
+
+    def write(self) -> Tuple[bool, bool]:
+        markdown = self.state.markdown()
+        wrote_state = markdown != self._markdown
+        if wrote_state:
+            atomic_write_text(self.state_md, markdown)
+            self._markdown = markdown
+        wrote_launcher = write_launcher_argument(self.launcher, self.state.disable_argument())
+        return wrote_state, wrote_launcher
+
+    def sync(self) -> Dict:
+        started = time.perf_counter()
+        self.load_state()
+        changed = self.sync_from_launcher()
+        self.measure_sizes()
+        wrote_state, wrote_launcher = self.write()
+        enabled = sum(self.state.enabled)
+        return {
+            "name": self.name,
+            "packs": len(self.state.catalogue),
+            "enabled": enabled,
+            "disabled": len(self.state.catalogue) - enabled,
+            "changed": changed,
+            "storage": self.state.storage(),
+            "wroteState": wrote_state,
+            "wroteLauncher": wrote_launcher,
+            "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+
+def read_fleet_manifest(path: Path) -> List[ChecklistTarget]:
+    # A JSON list of {"name", "launcher", "state", "install_dir"} objects, or
+    # {"targets": [...]}; relative paths resolve against the manifest.
+    data = json.loads(path.read_text(encoding="utf-8"))
+    entries = data.get("targets") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise ValueError(f"{path}: expected a list of targets.")
+    base = path.resolve().parent
+    targets: List[ChecklistTarget] = []
+    for index, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict) or not entry.get("launcher") or not entry.get("state"):
+            raise ValueError(f"{path}: target {index} needs 'launcher' and 'state' paths.")
+        launcher = base / _resolve_launcher_path(str(entry["launcher"]))
+        state_md = base / Path(str(entry["state"]))
+        install_dir = entry.get("install_dir")
+        targets.append(
+            ChecklistTarget(
+                str(entry.get("name") or launcher.parent.name or index),
+                launcher,
+                state_md,
+                base / _resolve_launcher_path(str(install_dir)) if install_dir else None,
             )
-            return
+        )
+    return targets
+
+
+def _sync_fleet_target(target: Tuple[str, str, str, str | None]) -> Dict:
+    name, launcher, state_md, install_dir = target
+    try:
+        return ChecklistTarget(
+            name, Path(launcher), Path(state_md), Path(install_dir) if install_dir else None
+        ).sync()
+    except (OSError, ValueError) as error:
+        return {"name": name, "error": str(error)}
+
+
+def run_fleet(targets: List[ChecklistTarget], jobs: int | None = None) -> List[Dict]:
+    # Parse the defaults before the pool starts. Forked workers inherit them;
+    # under spawn or forkserver (Windows, macOS, and Linux from Python 3.14)
+    # each worker parses raw.txt once, on its first target.
+    get_default_pack_state()
+    get_default_code_to_category()
+    specs = [
+        (
+            target.name,
+            str(target.launcher),
+            str(target.state_md),
+            None if target.install_dir is None else str(target.install_dir),
+        )
+        for target in targets
+    ]
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_sync_fleet_target, specs))
+
+
+def format_fleet_summary(summary: Dict) -> str:
+    if "error" in summary:
+        return f"{summary['name']}: failed: {summary['error']}"
+    storage = summary["storage"]
+    written = [
+        label
+        for label, wrote in (("state", summary["wroteState"]), ("launcher", summary["wroteLauncher"]))
+        if wrote
+    ]
+    return (
+        f"{summary['name']}: {summary['enabled']}/{summary['packs']} enabled "
+        f"({storage['enabledGB']:.2f} GB, {storage['disabledGB']:.2f} GB disabled), "
+        f"{summary['changed']} changed from launcher, "
+        f"wrote {', '.join(written) or 'nothing'} [{summary['elapsedMs']:.1f} ms]"
+    )
+
+
+def _run_command(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    # Headless subcommands; none of them import gui.py or Qt.
+    if args.command == "get-arg":
+        print(current_disable_argument())
+    elif args.command == "set-arg":
         try:
-            payload = apply_disable_argument(argument, write_state=True, sync_launcher_file=True)
+            payload = apply_disable_argument(" ".join(args.argument), since=get_state_version())
         except ValueError as error:
-            QtWidgets.QMessageBox.warning(self, "Invalid Argument", str(error))
+            parser.error(str(error))
+        print(payload["disableArgument"])
+    elif args.command == "toggle":
+        enabled = args.state == "on"
+        try:
+            update_item_state(args.code, enabled, since=get_state_version())
+        except KeyError as error:
+            parser.error(f"DLC code '{error.args[0]}' could not be found.")
+        print(f"{args.code.strip().upper()} {'enabled' if enabled else 'disabled'}")
+    elif args.command == "status":
+        payload = build_payload()
+        if args.json:
+            print(json.dumps({key: value for key, value in payload.items() if key != "markdown"}))
             return
-        self._apply_payload(payload)
-        self.statusBar().showMessage("Disable argument applied.", 3000)
-
-    def reset_state_to_default(self) -> None:
-        payload = reset_state_to_default()
-        self._apply_payload(payload)
-        self.statusBar().showMessage("Checklist reset to defaults.", 3000)
-
-    def refresh_from_launcher(self) -> None:
-        changed = sync_state_from_launcher(force=True)
-        self.refresh_payload()
-        if changed:
-            self.statusBar().showMessage("State synced from launcher file.", 3000)
-        else:
-            self.statusBar().showMessage("Launcher file already in sync.", 3000)
+        items = [item for category in payload["categories"] for item in category["items"]]
+        enabled = sum(1 for item in items if item["enabled"])
+        storage = payload["storage"]
+        print(f"{enabled}/{len(items)} packs enabled, updated {payload['updatedAt']}")
+        print(
+            f"Enabled: {storage['enabledGB']:.2f} GB | Disabled: {storage['disabledGB']:.2f} GB | Total: {storage['totalGB']:.2f} GB"
+        )
+        print(payload["disableArgument"])
+    elif args.command == "storage":
+        storage = current_storage()
+        print(
+            f"Enabled: {storage['enabledGB']:.2f} GB | Disabled: {storage['disabledGB']:.2f} GB | Total: {storage['totalGB']:.2f} GB"
+        )
+    flush_pending_writes()
 
 
 def main() -> None:
@@ -801,18 +2672,127 @@ def main() -> None:
         action="store_true",
         help="Create markdown outputs and exit without starting the UI.",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--profile",
+        metavar="NAME",
+        help="Switch to a saved profile before starting (or before exiting with --init-only).",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Serve the browser front-end and JSON API instead of starting the UI.",
+    )
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_SERVE_HOST,
+        help=f"Address to bind with --serve (default: {DEFAULT_SERVE_HOST}).",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_SERVE_PORT,
+        help=f"Port to bind with --serve (default: {DEFAULT_SERVE_PORT}).",
+    )
+    parser.add_argument(
+        "--fleet",
+        type=Path,
+        metavar="MANIFEST",
+        help="Sync every launcher/state/install target listed in a JSON manifest and exit.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Worker processes for --fleet (default: one per CPU).",
+    )
+    parser.add_argument(
+        "--journal-fsync",
+        choices=JOURNAL_FSYNC_POLICIES,
+        help="When to fsync the state journal: after every change, at most once a second "
+        "(the default, or SIMS4_JOURNAL_FSYNC), or never.",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        metavar="PATH",
+        help="Record timed spans for start-up stages and state operations and write them to PATH on exit.",
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=TRACE_FORMATS,
+        default="chrome",
+        help="Report format for --trace: a Chrome trace (chrome://tracing, Perfetto) or per-span totals.",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.add_parser("get-arg", help="Print the current -disablepacks argument.")
+    set_arg = commands.add_parser(
+        "set-arg", help="Apply a -disablepacks argument to the checklist and the launcher."
+    )
+    set_arg.add_argument("argument", nargs="*", help="The -disablepacks:... argument.")
+    toggle = commands.add_parser("toggle", help="Enable or disable one pack.")
+    toggle.add_argument("code", help="Pack code, for example EP01.")
+    toggle.add_argument("state", choices=("on", "off"))
+    status = commands.add_parser("status", help="Print pack counts, storage and the disable argument.")
+    status.add_argument("--json", action="store_true", help="Print the full state as JSON.")
+    commands.add_parser("storage", help="Print enabled, disabled and total pack storage.")
+    # The set-arg value starts with a dash, so argparse reports it as unknown.
+    args, extras = parser.parse_known_args()
+    if args.command == "set-arg":
+        args.argument += extras
+    elif extras:
+        parser.error(f"unrecognized arguments: {' '.join(extras)}")
+
+    if args.journal_fsync is not None:
+        set_journal_fsync_policy(args.journal_fsync)
+
+    if args.trace is not None:
+        enable_tracing()
+        atexit.register(_write_trace_at_exit, args.trace, args.trace_format)
+
+    if args.fleet is not None:
+        if args.jobs is not None and args.jobs < 1:
+            parser.error("--jobs must be at least 1")
+        try:
+            targets = read_fleet_manifest(args.fleet)
+        except (OSError, ValueError) as error:
+            parser.error(f"cannot read fleet manifest: {error}")
+        summaries = run_fleet(targets, args.jobs)
+        for summary in summaries:
+            print(format_fleet_summary(summary))
+        failed = sum("error" in summary for summary in summaries)
+        print(f"{len(summaries) - failed}/{len(summaries)} targets synced")
+        sys.exit(1 if failed else 0)
+
+    if args.profile is not None:
+        try:
+            switch_profile(args.profile)
+        except KeyError:
+            names = ", ".join(profile["name"] for profile in list_profiles()) or "none saved"
+            parser.error(f"unknown profile '{args.profile}' (available: {names})")
+
+    if args.command is not None:
+        _run_command(parser, args)
+        return
 
     if args.init_only:
-        bootstrap_state()
+        ensure_bootstrapped()
+        refresh_pack_sizes()
+        flush_pending_writes()
         print(f"State synced to {STATE_MD.name}")
         return
 
-    app = QtWidgets.QApplication(sys.argv)
-    window = ChecklistWindow()
-    window.show()
-    sys.exit(app.exec())
+    if args.serve:
+        import web
+
+        web.serve(args.host, args.port)
+        return
+
+    import gui
+
+    gui.run()
 
 
 if __name__ == "__main__":
+    # gui.py and web.py import this module by name; share it rather than loading a
+    # second copy with its own state.
+    sys.modules.setdefault("main", sys.modules[__name__])
     main()
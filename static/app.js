@@ -7,7 +7,15 @@
   const disableOutput = document.getElementById("disable-output");
   const markdownOutput = document.getElementById("markdown-output");
 
-  let state = dataEl ? JSON.parse(dataEl.textContent) : null;
+  let state = null;
+  const itemsByCode = new Map();
+  const cardsByCode = new Map();
+  const sectionsByTitle = new Map();
+  const pendingItems = new Map();
+  let pendingFull = null;
+  let frameRequested = false;
+  let markdownTimer = 0;
+  const MARKDOWN_REFRESH_MS = 300;
 
   const showStatus = (message, success = true) => {
     if (!statusEl) {
@@ -30,6 +38,25 @@
     markdownOutput.value = payload.markdown || "";
   };
 
+  const refreshMarkdown = () => {
+    window.clearTimeout(markdownTimer);
+    markdownTimer = 0;
+    return request("/api/markdown")
+      .then((data) => {
+        if (state && data.epoch === state.epoch && data.version >= state.version) {
+          state.markdown = data.markdown;
+          markdownOutput.value = data.markdown;
+        }
+      })
+      .catch((error) => showStatus(error.message, false));
+  };
+
+  // Deltas carry no markdown; fetch it once a burst of changes settles.
+  const scheduleMarkdown = () => {
+    window.clearTimeout(markdownTimer);
+    markdownTimer = window.setTimeout(refreshMarkdown, MARKDOWN_REFRESH_MS);
+  };
+
   const createIcon = (code) => {
     const svg = document.createElementNS(svgNS, "svg");
     const use = document.createElementNS(svgNS, "use");
@@ -43,61 +70,221 @@
     return svg;
   };
 
+  const placeInOrder = (parent, nodes) => {
+    let cursor = parent.firstChild;
+    nodes.forEach((node) => {
+      if (node === cursor) {
+        cursor = cursor.nextSibling;
+      } else {
+        parent.insertBefore(node, cursor);
+      }
+    });
+    while (cursor) {
+      const next = cursor.nextSibling;
+      parent.removeChild(cursor);
+      cursor = next;
+    }
+  };
+
+  const createSection = (title) => {
+    const section = document.createElement("article");
+    section.className = "dlc-section";
+
+    const header = document.createElement("div");
+    header.className = "dlc-section-header";
+
+    const heading = document.createElement("h2");
+    heading.textContent = title;
+    header.appendChild(heading);
+
+    const actions = document.createElement("div");
+    actions.className = "dlc-section-actions";
+    [
+      ["Enable all", true],
+      ["Disable all", false],
+    ].forEach(([label, enabled]) => {
+      const button = document.createElement("button");
+      button.type = "button";
+      button.dataset.action = "category-toggle";
+      button.dataset.title = title;
+      button.dataset.enabled = enabled ? "true" : "false";
+      button.textContent = label;
+      actions.appendChild(button);
+    });
+    header.appendChild(actions);
+    section.appendChild(header);
+
+    const grid = document.createElement("div");
+    grid.className = "dlc-grid";
+    section.appendChild(grid);
+    return { section, grid };
+  };
+
+  const createCard = (item) => {
+    const card = document.createElement("div");
+    card.className = "dlc-card";
+    card.dataset.code = item.code;
+    card.appendChild(createIcon(item.code));
+
+    const name = document.createElement("div");
+    name.className = "dlc-name";
+    card.appendChild(name);
+
+    const code = document.createElement("div");
+    code.className = "dlc-code";
+    code.textContent = item.code;
+    card.appendChild(code);
+
+    const toggle = document.createElement("button");
+    toggle.className = "toggle";
+    toggle.type = "button";
+    toggle.dataset.code = item.code;
+    card.appendChild(toggle);
+
+    return { card, name, toggle, enabled: null, label: null };
+  };
+
+  const patchCard = (entry, item) => {
+    if (entry.enabled !== item.enabled) {
+      const value = item.enabled ? "true" : "false";
+      entry.card.dataset.enabled = value;
+      entry.toggle.dataset.enabled = value;
+      entry.toggle.textContent = item.enabled ? "Enabled" : "Disabled";
+      entry.enabled = item.enabled;
+    }
+    if (entry.label !== item.name) {
+      entry.name.textContent = item.name;
+      entry.label = item.name;
+    }
+  };
+
   const renderCategories = (payload) => {
-    if (!categoriesEl || !payload) {
+    if (!categoriesEl) {
       return;
     }
-    categoriesEl.innerHTML = "";
-    payload.categories.forEach((category) => {
-      const section = document.createElement("article");
-      section.className = "dlc-section";
-
-      const heading = document.createElement("h2");
-      heading.textContent = category.title;
-      section.appendChild(heading);
-
-      const grid = document.createElement("div");
-      grid.className = "dlc-grid";
-      category.items.forEach((item) => {
-        const card = document.createElement("div");
-        card.className = "dlc-card";
-        card.dataset.enabled = item.enabled ? "true" : "false";
-
-        const icon = createIcon(item.code);
-        card.appendChild(icon);
-
-        const name = document.createElement("div");
-        name.className = "dlc-name";
-        name.textContent = item.name;
-        card.appendChild(name);
-
-        const code = document.createElement("div");
-        code.className = "dlc-code";
-        code.textContent = item.code;
-        card.appendChild(code);
-
-        const toggle = document.createElement("button");
-        toggle.className = "toggle";
-        toggle.type = "button";
-        toggle.dataset.code = item.code;
-        toggle.dataset.enabled = item.enabled ? "true" : "false";
-        toggle.textContent = item.enabled ? "Enabled" : "Disabled";
-        card.appendChild(toggle);
-
-        grid.appendChild(card);
+    const titles = new Set();
+    const codes = new Set();
+    const sections = payload.categories.map((category) => {
+      let entry = sectionsByTitle.get(category.title);
+      if (!entry) {
+        entry = createSection(category.title);
+        sectionsByTitle.set(category.title, entry);
+      }
+      titles.add(category.title);
+      const cards = category.items.map((item) => {
+        let card = cardsByCode.get(item.code);
+        if (!card) {
+          card = createCard(item);
+          cardsByCode.set(item.code, card);
+        }
+        codes.add(item.code);
+        patchCard(card, item);
+        return card.card;
       });
+      placeInOrder(entry.grid, cards);
+      return entry.section;
+    });
+    placeInOrder(categoriesEl, sections);
+    sectionsByTitle.forEach((_entry, title) => {
+      if (!titles.has(title)) {
+        sectionsByTitle.delete(title);
+      }
+    });
+    cardsByCode.forEach((_entry, code) => {
+      if (!codes.has(code)) {
+        cardsByCode.delete(code);
+      }
+    });
+  };
+
+  const flushFrame = () => {
+    frameRequested = false;
+    if (pendingFull) {
+      renderCategories(pendingFull);
+      pendingFull = null;
+    }
+    pendingItems.forEach((item, code) => {
+      const entry = cardsByCode.get(code);
+      if (entry) {
+        patchCard(entry, item);
+      }
+    });
+    pendingItems.clear();
+    renderOutputs(state);
+  };
+
+  const scheduleFrame = () => {
+    if (!frameRequested) {
+      frameRequested = true;
+      window.requestAnimationFrame(flushFrame);
+    }
+  };
 
-      section.appendChild(grid);
-      categoriesEl.appendChild(section);
+  const indexState = (payload) => {
+    itemsByCode.clear();
+    payload.categories.forEach((category) => {
+      category.items.forEach((item) => itemsByCode.set(item.code, item));
     });
   };
 
+  const reloadState = () => {
+    request("/api/state")
+      .then(render)
+      .catch((error) => showStatus(error.message, false));
+  };
+
+  // Full payloads replace the model; deltas are merged into it in place and
+  // only the cards they name are patched on the next animation frame.
+  // Versions restart with the server, so they are only compared within an
+  // epoch; a payload from a new epoch always replaces the model.
   const render = (payload) => {
-    state = payload;
-    renderCategories(payload);
-    renderOutputs(payload);
+    if (!payload) {
+      return;
+    }
+    const sameEpoch = state && payload.epoch === state.epoch;
+    if (payload.full) {
+      if (sameEpoch && payload.version < state.version) {
+        return;
+      }
+      state = payload;
+      indexState(payload);
+      pendingFull = payload;
+      pendingItems.clear();
+    } else {
+      if (!sameEpoch || payload.since > state.version) {
+        reloadState();
+        return;
+      }
+      if (payload.version <= state.version) {
+        return;
+      }
+      if (payload.items.some((item) => !itemsByCode.has(item.code))) {
+        reloadState();
+        return;
+      }
+      payload.items.forEach((item) => {
+        const current = itemsByCode.get(item.code);
+        Object.assign(current, item);
+        pendingItems.set(item.code, current);
+      });
+      const { items, since, full, ...aggregates } = payload;
+      Object.assign(state, aggregates);
+      scheduleMarkdown();
+    }
+    scheduleFrame();
+  };
+
+  const connectEvents = () => {
+    if (!window.EventSource) {
+      return;
+    }
+    const query = state ? `?since=${state.epoch}-${state.version}` : "";
+    const source = new EventSource(`/api/events${query}`);
+    source.addEventListener("state", (event) => render(JSON.parse(event.data)));
   };
 
+  const currentVersion = () => (state ? state.version : undefined);
+
   const request = async (url, options = {}) => {
     const response = await fetch(url, {
       headers: { "Content-Type": "application/json", ...(options.headers || {}) },
@@ -119,7 +306,7 @@
     try {
       const payload = await request("/api/toggle", {
         method: "POST",
-        body: JSON.stringify({ code, enabled: nextEnabled }),
+        body: JSON.stringify({ code, enabled: nextEnabled, since: currentVersion() }),
       });
       render(payload);
       showStatus("State updated.");
@@ -128,6 +315,29 @@
     }
   };
 
+  const handleCategoryToggle = async (button) => {
+    const category = state && state.categories.find((entry) => entry.title === button.dataset.title);
+    if (!category) {
+      return;
+    }
+    const enabled = button.dataset.enabled === "true";
+    const changes = {};
+    category.items.forEach((item) => {
+      changes[item.code] = enabled;
+    });
+    showStatus("Saving...");
+    try {
+      const payload = await request("/api/batch", {
+        method: "POST",
+        body: JSON.stringify({ changes, since: currentVersion() }),
+      });
+      render(payload);
+      showStatus(`${category.title}: all packs ${enabled ? "enabled" : "disabled"}.`);
+    } catch (error) {
+      showStatus(error.message, false);
+    }
+  };
+
   const handleReset = async () => {
     if (!window.confirm("Reset all DLC toggles to the default checklist?")) {
       return;
@@ -166,7 +376,7 @@
     try {
       const payload = await request("/api/disable", {
         method: "POST",
-        body: JSON.stringify({ argument }),
+        body: JSON.stringify({ argument, since: currentVersion() }),
       });
       render(payload);
       showStatus("Disable list applied.");
@@ -180,6 +390,9 @@
     if (!field) {
       return;
     }
+    if (field === markdownOutput && markdownTimer) {
+      await refreshMarkdown();
+    }
     try {
       await navigator.clipboard.writeText(field.value);
       showStatus("Copied to clipboard.");
@@ -197,6 +410,8 @@
     }
     if (target.matches(".toggle")) {
       handleToggle(target);
+    } else if (target.dataset.action === "category-toggle") {
+      handleCategoryToggle(target);
     } else if (target.dataset.action === "reset") {
       handleReset();
     } else if (target.dataset.action === "refresh") {
@@ -208,9 +423,11 @@
     }
   });
 
-  if (state) {
-    render(state);
+  const initial = dataEl ? JSON.parse(dataEl.textContent) : null;
+  if (initial) {
+    render(initial);
   } else {
     handleRefresh();
   }
+  connectEvents();
 })();
@@ -0,0 +1,44 @@
+import importlib.util
+import itertools
+import shutil
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+LAUNCHER_TEXT = (
+    "@echo off\n"
+    "set ARGS=-applaunch 1222670 -console -disablepacks:EP06,GP04\n"
+    'start "" %ARGS%\n'
+)
+_instances = itertools.count()
+
+
+@pytest.fixture
+def workdir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    # main.py keeps its files next to itself, so each test runs a private copy.
+    for name in ("main.py", "raw.txt"):
+        shutil.copy(REPO_DIR / name, tmp_path / name)
+    launcher = tmp_path / "launcher.bat"
+    launcher.write_text(LAUNCHER_TEXT, encoding="utf-8")
+    monkeypatch.setenv("SIMS4_BAT_PATH", str(launcher))
+    monkeypatch.setenv("SIMS4_GAME_PATH", str(tmp_path / "no-game"))
+    monkeypatch.delenv("SIMS4_JOURNAL_FSYNC", raising=False)
+    return tmp_path
+
+
+@pytest.fixture
+def start(workdir: Path) -> Callable[[], ModuleType]:
+    """Starts the checklist from workdir in a fresh module, like a new process."""
+
+    def load() -> ModuleType:
+        name = f"checklist_{next(_instances)}"
+        spec = importlib.util.spec_from_file_location(name, workdir / "main.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    return load
+
@@ -0,0 +1,97 @@
+from types import ModuleType
+
+
+def crash(module: ModuleType) -> None:
+    # Changes still reach the journal, but the write-behind writer never runs,
+    # as if the process died straight after them.
+    module.STATE_WRITER.schedule = lambda **_kwargs: None
+
+
+def launcher_argument(module: ModuleType) -> str:
+    return module.extract_disable_argument(module.get_launcher_path().read_text(encoding="utf-8"))
+
+
+def test_replay_after_crash_restores_state_and_launcher(start):
+    first = start()
+    first.ensure_bootstrapped()
+    first.flush_pending_writes()
+    crash(first)
+    first.update_item_state("EP01", False)
+    first.update_items_state({"EP02": False, "EP06": True})
+    expected = first.current_disable_argument()
+    assert "EP01" not in launcher_argument(first)
+
+    second = start()
+    second.ensure_bootstrapped()
+    assert second.current_disable_argument() == expected
+    assert bytes(second._state.enabled) == bytes(first._state.enabled)
+    assert launcher_argument(second) == expected
+
+
+def test_torn_last_journal_line_is_ignored(start):
+    first = start()
+    first.ensure_bootstrapped()
+    first.flush_pending_writes()
+    crash(first)
+    first.update_item_state("EP01", False)
+    first.update_item_state("EP02", False)
+    journal = first.JOURNAL_FILE.read_bytes()
+    assert journal.count(b"\n") == 2
+    first.JOURNAL_FILE.write_bytes(journal[:-7])
+
+    records, intact = first.read_journal(0)
+    assert [record["seq"] for _seq, _line, record in records] == [records[0][0]]
+    assert not intact
+
+    second = start()
+    second.ensure_bootstrapped()
+    argument = second.current_disable_argument()
+    assert "EP01" in argument
+    assert "EP02" not in argument
+    assert launcher_argument(second) == argument
+
+
+def test_undo_and_redo_stop_at_the_ends_of_the_history(start):
+    module = start()
+    module.ensure_bootstrapped()
+    while module.history_depth()[0]:
+        module.undo_last_change()
+    while module.history_depth()[1]:
+        module.redo_last_change()
+    version = module.get_state_version()
+    baseline = module.current_disable_argument()
+
+    module.redo_last_change()
+    assert module.get_state_version() == version
+
+    module.update_item_state("EP01", False)
+    module.update_item_state("EP02", False)
+    undo_depth = module.history_depth()[0]
+    module.undo_last_change()
+    module.undo_last_change()
+    assert module.current_disable_argument() == baseline
+    assert module.history_depth() == (undo_depth - 2, 2)
+
+    module.redo_last_change()
+    assert "EP01" in module.current_disable_argument()
+    module.redo_last_change()
+    assert module.history_depth()[1] == 0
+    version = module.get_state_version()
+    module.redo_last_change()
+    assert module.get_state_version() == version
+
+    while module.history_depth()[0]:
+        module.undo_last_change()
+    version = module.get_state_version()
+    module.undo_last_change()
+    assert module.get_state_version() == version
+
+
+def test_a_new_change_clears_the_redo_history(start):
+    module = start()
+    module.ensure_bootstrapped()
+    module.update_item_state("EP01", False)
+    module.undo_last_change()
+    assert module.history_depth()[1] == 1
+    module.update_item_state("EP02", False)
+    assert module.history_depth()[1] == 0
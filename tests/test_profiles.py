@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+
+def write_profiles(module, catalogues, profiles) -> None:
+    data = {"version": module.PROFILES_VERSION, "catalogues": catalogues, "profiles": profiles}
+    module.PROFILES_FILE.write_text(json.dumps(data), encoding="utf-8")
+
+
+def profile_entry(catalogue) -> dict:
+    return {
+        "catalogue": catalogue,
+        "mask": "1",
+        "storage": {"enabledGB": 1.0, "disabledGB": 0.5, "totalGB": 1.5},
+    }
+
+
+@pytest.mark.parametrize(
+    ("catalogues", "profiles"),
+    [
+        ([["EP01"]], []),
+        (5, {"Saved": profile_entry(0)}),
+        ([5], {"Saved": profile_entry(0)}),
+        ([["EP01", 2]], {"Saved": profile_entry(0)}),
+    ],
+)
+def test_malformed_profiles_file_is_treated_as_empty(start, catalogues, profiles):
+    checklist = start()
+    write_profiles(checklist, catalogues, profiles)
+    assert checklist.list_profiles() == []
+
+
+def test_profile_with_invalid_catalogue_index_is_skipped(start):
+    checklist = start()
+    write_profiles(
+        checklist,
+        [["EP01"], ["EP02"]],
+        {"Negative": profile_entry(-1), "Flag": profile_entry(True), "Saved": profile_entry(1)},
+    )
+    assert [profile["name"] for profile in checklist.list_profiles()] == ["Saved"]
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+
+def edit_state_md(module, old: str, new: str) -> None:
+    previous = module.STATE_MD.stat()
+    text = module.STATE_MD.read_text(encoding="utf-8")
+    assert old in text
+    module.STATE_MD.write_text(text.replace(old, new), encoding="utf-8")
+    os.utime(module.STATE_MD, ns=(previous.st_atime_ns, previous.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def no_full_reparse(monkeypatch):
+    def refuse(module):
+        def refresh_state_from_disk(**_kwargs):
+            raise AssertionError("state.md edit took the full re-parse")
+
+        monkeypatch.setattr(module, "refresh_state_from_disk", refresh_state_from_disk)
+
+    return refuse
+
+
+def test_single_checkbox_edit_is_applied_incrementally(start, no_full_reparse):
+    module = start()
+    module.ensure_bootstrapped()
+    module.flush_pending_writes()
+    no_full_reparse(module)
+    undo_depth = module.history_depth()[0]
+
+    edit_state_md(module, "- [x] EP01", "- [ ] EP01")
+    assert module.reload_state_from_disk()
+    assert "EP01" in module.current_disable_argument()
+    assert module.history_depth()[0] == undo_depth + 1
+
+
+def test_edits_in_two_categories_and_the_output_line_stay_incremental(start, no_full_reparse):
+    module = start()
+    module.ensure_bootstrapped()
+    module.flush_pending_writes()
+    no_full_reparse(module)
+    argument = module.current_disable_argument()
+
+    edit_state_md(module, "- [x] EP01", "- [ ] EP01")
+    edit_state_md(module, "- [x] GP01", "- [ ] GP01")
+    edit_state_md(module, argument, argument + ",EP01,GP01")
+    assert module.reload_state_from_disk()
+    disable = module.current_disable_argument()
+    assert "EP01" in disable and "GP01" in disable
+
+
+def test_first_edit_after_a_snapshot_start_is_incremental(start, no_full_reparse):
+    first = start()
+    first.ensure_bootstrapped()
+    first.flush_pending_writes()
+
+    second = start()
+    second.ensure_bootstrapped()
+    no_full_reparse(second)
+    edit_state_md(second, "- [x] EP02", "- [ ] EP02")
+    assert second.reload_state_from_disk()
+    assert "EP02" in second.current_disable_argument()
+
+
+def test_renamed_pack_falls_back_to_the_full_reparse(start):
+    module = start()
+    module.ensure_bootstrapped()
+    module.flush_pending_writes()
+
+    edit_state_md(module, "- [x] EP01 - ", "- [ ] EP01 - Renamed ")
+    assert module.reload_state_from_disk()
+    module.flush_pending_writes()
+    disable = module.current_disable_argument()
+    assert "EP01" in disable
+    assert "EP01" in module.extract_disable_argument(
+        module.get_launcher_path().read_text(encoding="utf-8")
+    )
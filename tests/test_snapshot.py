@@ -0,0 +1,74 @@
+import os
+import struct
+
+
+def test_snapshot_round_trips_a_custom_catalogue(start, tmp_path):
+    module = start()
+    categories = module.merge_categories_with_defaults(module.get_default_categories())
+    categories.append(
+        {
+            "title": "Extra",
+            "items": [{"code": "ZZ01", "name": "Custom ñ", "enabled": False, "size_gb": 1.25}],
+        }
+    )
+    state = module.PackState.from_categories(categories)
+    path = tmp_path / "custom.snapshot"
+    path.write_bytes(module.encode_state_snapshot(state, (123, 456), 7))
+
+    loaded, exported, journal_seq = module.read_state_snapshot(path)
+    assert (exported, journal_seq) == ((123, 456), 7)
+    assert loaded.catalogue.titles == state.catalogue.titles
+    assert loaded.catalogue.codes == state.catalogue.codes
+    assert [record.name for record in loaded.catalogue.records] == [
+        record.name for record in state.catalogue.records
+    ]
+    assert loaded.enabled == state.enabled
+    assert list(loaded.sizes) == list(state.sizes)
+    assert loaded.disabled_mask == state.disabled_mask
+
+
+def test_snapshot_reuses_the_default_catalogue(start):
+    module = start()
+    module.ensure_bootstrapped()
+    module.flush_pending_writes()
+    loaded, exported, _journal_seq = module.read_state_snapshot()
+    assert loaded.catalogue is module.get_default_pack_state().catalogue
+    assert exported == module._file_signature(module.STATE_MD)
+
+
+def test_snapshot_with_another_version_or_truncated_is_rejected(start, tmp_path):
+    module = start()
+    state = module.get_default_pack_state()
+    data = module.encode_state_snapshot(state, None)
+    path = tmp_path / "other.snapshot"
+
+    path.write_bytes(data[:4] + struct.pack("<H", module.STATE_SNAPSHOT_VERSION + 1) + data[6:])
+    assert module.read_state_snapshot(path) is None
+    path.write_bytes(data[:-1])
+    assert module.read_state_snapshot(path) is None
+
+
+def test_state_md_edited_after_the_snapshot_wins(start):
+    first = start()
+    first.ensure_bootstrapped()
+    first.flush_pending_writes()
+    exported = first.STATE_MD.stat()
+    text = first.STATE_MD.read_text(encoding="utf-8").replace("- [x] EP01", "- [ ] EP01")
+    first.STATE_MD.write_text(text, encoding="utf-8")
+    os.utime(first.STATE_MD, ns=(exported.st_atime_ns, exported.st_mtime_ns + 1_000_000))
+
+    second = start()
+    assert not second.load_state_snapshot()
+    second.refresh_state_from_disk()
+    assert "EP01" in second._state.disable_argument()
+
+
+def test_unchanged_state_md_starts_from_the_snapshot(start):
+    first = start()
+    first.ensure_bootstrapped()
+    first.update_item_state("EP01", False)
+    first.flush_pending_writes()
+
+    second = start()
+    assert second.load_state_snapshot()
+    assert "EP01" in second.current_disable_argument()
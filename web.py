@@ -0,0 +1,378 @@
+import gzip
+import json
+import mimetypes
+import re
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from main import (
+    BASE_DIR,
+    DEFAULT_SERVE_HOST,
+    DEFAULT_SERVE_PORT,
+    STATE_MD,
+    SVG_FILE,
+    LauncherPoller,
+    apply_disable_argument,
+    build_payload,
+    current_markdown,
+    ensure_bootstrapped,
+    flush_pending_writes,
+    get_launcher_path,
+    reload_state_from_disk,
+    reset_state_to_default,
+    set_launcher_watch_active,
+    start_pack_size_refresh,
+    sync_state_from_launcher,
+    update_item_state,
+    update_items_state,
+    wait_for_payload,
+)
+
+TEMPLATES_DIR = BASE_DIR / "templates"
+STATIC_DIR = BASE_DIR / "static"
+INDEX_TEMPLATE = TEMPLATES_DIR / "index.html"
+GZIP_MIN_BYTES = 512
+RESPONSE_CACHE_LIMIT = 256
+EVENT_HEARTBEAT_SECONDS = 15.0
+TEMPLATE_TAG_REGEX = re.compile(r"\{\{\s*(.*?)\s*\}\}")
+STATIC_URL_REGEX = re.compile(r"url_for\('static',\s*filename='([^']+)'\)")
+HTML_SAFE_JSON = str.maketrans({"<": "\\u003c", ">": "\\u003e", "&": "\\u0026", "'": "\\u0027"})
+SERVE_EPOCH = format(time.time_ns(), "x")
+
+
+class EncodedResponse:
+    """A response body with its ETag; the gzip encoding is built on first use."""
+
+    __slots__ = ("etag", "content_type", "body", "_gzipped")
+
+    def __init__(self, etag: str, content_type: str, body: bytes) -> None:
+        self.etag = etag
+        self.content_type = content_type
+        self.body = body
+        self._gzipped: bytes | None = None
+
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+
+RESPONSE_CACHE_LOCK = Lock()
+_response_cache: Dict[str, EncodedResponse] = {}
+
+
+def _cached_response(
+    key: str, etag: str, content_type: str, render: Callable[[], bytes]
+) -> EncodedResponse:
+    with RESPONSE_CACHE_LOCK:
+        cached = _response_cache.get(key)
+    if cached is not None and cached.etag == etag:
+        return cached
+    response = EncodedResponse(etag, content_type, render())
+    with RESPONSE_CACHE_LOCK:
+        if len(_response_cache) >= RESPONSE_CACHE_LIMIT:
+            _response_cache.clear()
+        _response_cache[key] = response
+    return response
+
+
+def _version_etag(version: int) -> str:
+    return f'"{SERVE_EPOCH}-{version}"'
+
+
+def _with_epoch(payload: Dict) -> Dict:
+    # Versions restart at 1 with the server, so clients compare epochs first.
+    return {**payload, "epoch": SERVE_EPOCH}
+
+
+def _html_safe_json(value: object) -> str:
+    return json.dumps(value).translate(HTML_SAFE_JSON)
+
+
+def _render_template_expression(expression: str, payload: Dict) -> str:
+    if expression == "sprite_url":
+        return "/svgs.html"
+    if expression == "initial_payload | tojson":
+        return _html_safe_json(payload)
+    match = STATIC_URL_REGEX.fullmatch(expression)
+    if match:
+        return "/static/" + match.group(1)
+    raise ValueError(f"Unsupported template expression: {expression}")
+
+
+def render_index_page(payload: Dict) -> str:
+    template = INDEX_TEMPLATE.read_text(encoding="utf-8")
+    return TEMPLATE_TAG_REGEX.sub(
+        lambda match: _render_template_expression(match.group(1), payload), template
+    )
+
+
+def _payload_response(payload: Dict) -> EncodedResponse:
+    return _cached_response(
+        f"/api/state:{payload.get('since')}",
+        _version_etag(payload["version"]),
+        "application/json",
+        lambda: json.dumps(_with_epoch(payload)).encode("utf-8"),
+    )
+
+
+def _markdown_response(payload: Dict) -> EncodedResponse:
+    return _cached_response(
+        "/api/markdown",
+        _version_etag(payload["version"]),
+        "application/json",
+        lambda: json.dumps(_with_epoch(payload)).encode("utf-8"),
+    )
+
+
+def _index_response() -> EncodedResponse:
+    payload = build_payload()
+    template_mtime = INDEX_TEMPLATE.stat().st_mtime_ns
+    return _cached_response(
+        "/",
+        f'"{SERVE_EPOCH}-{payload["version"]}-{template_mtime:x}"',
+        "text/html; charset=utf-8",
+        lambda: render_index_page(_with_epoch(payload)).encode("utf-8"),
+    )
+
+
+def _event_response(payload: Dict) -> EncodedResponse:
+    # Clients that last saw the same version receive the same delta, so the
+    # encoded event is shared between them.
+    version = payload["version"]
+    return _cached_response(
+        f"events:{payload.get('since')}",
+        _version_etag(version),
+        "text/event-stream",
+        lambda: (
+            f"id: {SERVE_EPOCH}-{version}\nevent: state\ndata: {json.dumps(_with_epoch(payload))}\n\n"
+        ).encode("utf-8"),
+    )
+
+
+def _parse_event_id(value: str | None) -> int | None:
+    # Event ids carry the server epoch so a client reconnecting after a
+    # restart gets a full payload rather than a delta against stale versions.
+    if not value:
+        return None
+    epoch, _, version = value.strip().rpartition("-")
+    if epoch != SERVE_EPOCH or not version.isdigit():
+        return None
+    return int(version)
+
+
+def _file_response(path: Path, content_type: str | None = None) -> EncodedResponse:
+    stat_result = path.stat()
+    if content_type is None:
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type.endswith("javascript"):
+            content_type += "; charset=utf-8"
+    return _cached_response(
+        str(path),
+        f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+        content_type,
+        path.read_bytes,
+    )
+
+
+def _static_file(url_path: str) -> Path | None:
+    root = STATIC_DIR.resolve()
+    candidate = (root / unquote(url_path)).resolve()
+    if root not in candidate.parents or not candidate.is_file():
+        return None
+    return candidate
+
+
+class ChecklistRequestHandler(BaseHTTPRequestHandler):
+    """JSON API plus the browser front-end, served over HTTP/1.1 keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "Sims4Checklist/1.0"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        path = url.path
+        if path == "/api/events":
+            # A reconnect's Last-Event-ID supersedes the page-load query; when
+            # either is from another epoch the client gets a full payload.
+            last_event_id = self.headers.get("Last-Event-ID")
+            if last_event_id is None:
+                last_event_id = parse_qs(url.query).get("since", [""])[0]
+            since = _parse_event_id(last_event_id)
+            self._stream_events(since)
+            return
+        try:
+            if path in ("/", "/index.html"):
+                response = _index_response()
+            elif path == "/api/state":
+                response = _payload_response(build_payload())
+            elif path == "/api/markdown":
+                response = _markdown_response(current_markdown())
+            elif path == "/svgs.html":
+                response = _file_response(SVG_FILE, "image/svg+xml")
+            elif path.startswith("/static/"):
+                static_path = _static_file(path[len("/static/"):])
+                if static_path is None:
+                    self._send_error(HTTPStatus.NOT_FOUND, "Not found.")
+                    return
+                response = _file_response(static_path)
+            else:
+                self._send_error(HTTPStatus.NOT_FOUND, "Not found.")
+                return
+        except OSError as error:
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(error))
+            return
+        self._send_response(response)
+
+    def do_POST(self) -> None:
+        path = urlsplit(self.path).path
+        try:
+            body = self._read_json_body()
+        except ValueError as error:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(error))
+            return
+        since = body.get("since")
+        if not isinstance(since, int) or isinstance(since, bool):
+            since = None
+        try:
+            if path == "/api/toggle":
+                code = body.get("code")
+                if not isinstance(code, str) or not code.strip():
+                    self._send_error(HTTPStatus.BAD_REQUEST, "Missing DLC code.")
+                    return
+                enabled = body.get("enabled")
+                if not isinstance(enabled, bool):
+                    self._send_error(HTTPStatus.BAD_REQUEST, "Enabled must be true or false.")
+                    return
+                payload = update_item_state(code, enabled, since=since)
+            elif path == "/api/disable":
+                argument = body.get("argument")
+                if not isinstance(argument, str):
+                    self._send_error(HTTPStatus.BAD_REQUEST, "Missing disable argument.")
+                    return
+                payload = apply_disable_argument(argument.strip(), since=since)
+            elif path == "/api/batch":
+                changes = body.get("changes")
+                if not isinstance(changes, dict) or not all(
+                    isinstance(code, str) and isinstance(enabled, bool)
+                    for code, enabled in changes.items()
+                ):
+                    self._send_error(
+                        HTTPStatus.BAD_REQUEST, "Changes must map DLC codes to true or false."
+                    )
+                    return
+                payload = update_items_state(changes, since=since)
+            elif path == "/api/reset":
+                payload = reset_state_to_default(since=since)
+            else:
+                self._send_error(HTTPStatus.NOT_FOUND, "Not found.")
+                return
+        except KeyError as error:
+            self._send_error(HTTPStatus.NOT_FOUND, f"DLC code '{error.args[0]}' could not be found.")
+            return
+        except ValueError as error:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(error))
+            return
+        self._send_response(_payload_response(payload), conditional=False)
+
+    def _stream_events(self, since: int | None) -> None:
+        ensure_bootstrapped()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            while True:
+                payload = wait_for_payload(since, EVENT_HEARTBEAT_SECONDS)
+                if payload is None:
+                    self.wfile.write(b": heartbeat\n\n")
+                else:
+                    since = payload["version"]
+                    self.wfile.write(_event_response(payload).body)
+                self.wfile.flush()
+        except ConnectionError:
+            return
+
+    def _read_json_body(self) -> Dict:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise ValueError("Invalid Content-Length.") from None
+        raw = self.rfile.read(length) if length > 0 else b""
+        if not raw.strip():
+            return {}
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            raise ValueError("Request body must be JSON.") from None
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object.")
+        return body
+
+    def _accepts_gzip(self) -> bool:
+        accepted = self.headers.get("Accept-Encoding", "")
+        return any(
+            part.split(";")[0].strip() == "gzip" for part in accepted.split(",")
+        )
+
+    def _send_response(self, response: EncodedResponse, *, conditional: bool = True) -> None:
+        if conditional and response.etag in self.headers.get("If-None-Match", ""):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", response.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = response.body
+        encoded = len(body) >= GZIP_MIN_BYTES and self._accepts_gzip()
+        if encoded:
+            body = response.gzipped()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", response.content_type)
+        self.send_header("ETag", response.etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if encoded:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(host: str = DEFAULT_SERVE_HOST, port: int = DEFAULT_SERVE_PORT) -> None:
+    ensure_bootstrapped()
+    pollers = [
+        LauncherPoller(get_launcher_path(), sync_state_from_launcher),
+        LauncherPoller(STATE_MD, reload_state_from_disk),
+    ]
+    set_launcher_watch_active(True)
+    for poller in pollers:
+        poller.start()
+    start_pack_size_refresh()
+    server = ThreadingHTTPServer((host, port), ChecklistRequestHandler)
+    server.daemon_threads = True
+    print(f"Serving the checklist on http://{host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for poller in pollers:
+            poller.stop()
+        set_launcher_watch_active(False)
+        flush_pending_writes()